@@ -9,29 +9,25 @@ with timestamps and random integers once per second.
 import logging
 import os
 import random
+import signal
+import sys
 import time
-from datetime import datetime
-from typing import Optional
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, List, Optional
 
-try:
-    from influxdb_client import InfluxDBClient, Point
-    from influxdb_client.client.write_api import SYNCHRONOUS
-except ImportError:
-    print("ERROR: influxdb-client not installed. Run: uv add influxdb-client")
-    exit(1)
+from influxdb_client import InfluxDBClient, WritePrecision
+from influxdb_client.client.write_api import WriteOptions
 
+# Make the src package importable when run as scripts/legacy_influx_writer.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-# Load configuration from environment variables
-def load_env_file(filepath: str = ".env") -> None:
-    """Load environment variables from .env file."""
-    if os.path.exists(filepath):
-        with open(filepath, "r") as file:
-            for line in file:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    os.environ[key] = value
-
+from src.config.settings import InfluxDBSettings, load_env_file  # noqa: E402
+from src.database.influx_client import (  # noqa: E402
+    close_influx_client,
+    get_influx_client,
+)
 
 # Load .env file if it exists
 load_env_file()
@@ -42,12 +38,68 @@ INFLUX_TOKEN = os.getenv("INFLUX_TOKEN", "my-super-secret-admin-token")
 INFLUX_ORG = os.getenv("INFLUX_ORG", "myorg")
 INFLUX_BUCKET = os.getenv("INFLUX_BUCKET", "mybucket")
 
+# Line protocol measurement and tag sets never change, so build them once
+SENSOR_PREFIX = "sensors,location=office,sensor_id=temp_001 "
+METRICS_PREFIX = "system_metrics,host=server01 "
+
+# Writes are handed to a separate process; cap how many may be in flight
+MAX_PENDING_WRITES = 8
+
+# Lines are buffered locally and handed over once enough have accumulated
+# or the oldest has waited FLUSH_INTERVAL seconds
+BUFFER_SIZE = 5000
+FLUSH_BATCH_SIZE = 1000
+FLUSH_INTERVAL = 5.0
+
+# Points are buffered and flushed by the client in the background
+WRITE_OPTIONS = WriteOptions(
+    batch_size=1000,
+    flush_interval=1000,
+    jitter_interval=200,
+    retry_interval=5000,
+    max_retries=5,
+    max_retry_delay=30000,
+    exponential_base=2,
+)
+
 # Logging setup
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
 )
+logging.getLogger().addHandler(_log_handler)
+logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Per-process client state for the writer pool
+_worker_client: Optional[InfluxDBClient] = None
+_worker_write_api: Any = None
+
+
+def _init_client(url: str, token: str, org: str) -> None:
+    """Create the InfluxDB client inside the writer process."""
+    global _worker_client, _worker_write_api
+    # Ctrl+C is handled by the parent, which flushes and stops the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Built directly: a forked process must not reuse the parent's client
+    _worker_client = InfluxDBClient(url=url, token=token, org=org, enable_gzip=True)
+    _worker_write_api = _worker_client.write_api(write_options=WRITE_OPTIONS)
+
+
+def _write_batch(bucket: str, lines: List[str]) -> None:
+    """Queue line protocol records on the writer process's write API."""
+    _worker_write_api.write(
+        bucket=bucket, record=lines, write_precision=WritePrecision.S
+    )
+
+
+def _close_client() -> None:
+    """Flush pending records and close the writer process's client."""
+    if _worker_write_api is not None:
+        _worker_write_api.close()
+    if _worker_client is not None:
+        _worker_client.close()
+
 
 class InfluxWriter:
     """Handles writing data to InfluxDB."""
@@ -57,13 +109,23 @@ class InfluxWriter:
         self.token = token
         self.org = org
         self.bucket = bucket
+        self.settings = InfluxDBSettings(url=url, token=token, org=org, bucket=bucket)
         self.client: Optional[InfluxDBClient] = None
-        self.write_api = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: Deque[Future] = deque()
+        self._buffer: Deque[str] = deque(maxlen=BUFFER_SIZE)
+        self._last_flush = time.monotonic()
+        self._rng = random.Random()
+
+    def ping(self) -> bool:
+        """Check whether the InfluxDB server is reachable."""
+        return get_influx_client(self.settings).ping()
 
     def connect(self) -> bool:
-        """Connect to InfluxDB and initialize write API."""
+        """Connect to InfluxDB and start the writer process."""
         try:
-            self.client = InfluxDBClient(url=self.url, token=self.token, org=self.org)
+            # Shared client with gzip enabled; reused across reconnect attempts
+            self.client = get_influx_client(self.settings)
 
             # Test connection
             ready = self.client.ready()
@@ -71,61 +133,99 @@ class InfluxWriter:
                 logger.error("InfluxDB is not ready")
                 return False
 
-            self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
+            # Serialization and HTTP writes run outside this process's GIL
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=1,
+                    initializer=_init_client,
+                    initargs=(self.url, self.token, self.org),
+                )
             logger.info("Successfully connected to InfluxDB")
             return True
 
         except Exception as e:
-            logger.error(f"Failed to connect to InfluxDB: {e}")
+            logger.error("Failed to connect to InfluxDB: %s", e)
             return False
 
     def write_dummy_data(self) -> bool:
         """Write a dummy data point with timestamp and random integer."""
-        if not self.write_api:
-            logger.error("Write API not initialized")
+        if not self._pool:
+            logger.error("Writer process not initialized")
             return False
 
         try:
             # Generate random data
-            random_value = random.randint(1, 100)
-            temperature = random.uniform(18.0, 25.0)  # Random temperature
-            humidity = random.uniform(40.0, 70.0)  # Random humidity
-
-            # Create data points
-            points = [
-                Point("sensors")
-                .tag("location", "office")
-                .tag("sensor_id", "temp_001")
-                .field("value", random_value)
-                .field("temperature", round(temperature, 2))
-                .field("humidity", round(humidity, 2))
-                .time(datetime.utcnow()),
-                Point("system_metrics")
-                .tag("host", "server01")
-                .field("cpu_usage", random.uniform(10.0, 90.0))
-                .field("memory_usage", random.uniform(30.0, 80.0))
-                .field("random_int", random_value)
-                .time(datetime.utcnow()),
-            ]
-
-            # Write points to InfluxDB
-            self.write_api.write(bucket=self.bucket, record=points)
+            rand = self._rng.random
+            random_value = self._rng.randrange(1, 101)
+            temperature = 18.0 + 7.0 * rand()  # Random temperature
+            humidity = 40.0 + 30.0 * rand()  # Random humidity
+            # One sample per second, so second precision is enough and
+            # compresses better than nanoseconds
+            timestamp = int(time.time())
+
+            cpu_usage = 10.0 + 80.0 * rand()
+            memory_usage = 30.0 + 50.0 * rand()
+
+            # Build line protocol directly; integer fields need the "i" suffix
+            buffer = self._buffer
+            buffer.append(
+                f"{SENSOR_PREFIX}value={random_value}i,"
+                f"temperature={temperature:.2f},humidity={humidity:.2f} {timestamp}"
+            )
+            buffer.append(
+                f"{METRICS_PREFIX}cpu_usage={cpu_usage},memory_usage={memory_usage},"
+                f"random_int={random_value}i {timestamp}"
+            )
+
+            if (
+                len(buffer) >= FLUSH_BATCH_SIZE
+                or time.monotonic() - self._last_flush >= FLUSH_INTERVAL
+            ):
+                self._flush_buffer()
 
             logger.info(
-                f"Written data: random_value={random_value}, "
-                f"temp={round(temperature, 2)}, "
-                f"humidity={round(humidity, 2)}"
+                "Buffered data: random_value=%d, temp=%.2f, humidity=%.2f",
+                random_value,
+                temperature,
+                humidity,
             )
             return True
 
         except Exception as e:
-            logger.error(f"Failed to write data: {e}")
+            logger.error("Failed to write data: %s", e)
             return False
 
+    def _flush_buffer(self) -> None:
+        """Hand buffered lines to the writer process without waiting on it."""
+        self._last_flush = time.monotonic()
+        if not self._buffer or self._pool is None:
+            return
+
+        lines = list(self._buffer)
+        self._buffer.clear()
+        self._pending.append(self._pool.submit(_write_batch, self.bucket, lines))
+        self._reap_pending()
+
+    def _reap_pending(self) -> None:
+        """Collect finished writes, blocking while too many are in flight."""
+        pending = self._pending
+        while pending and (pending[0].done() or len(pending) > MAX_PENDING_WRITES):
+            # result() re-raises any error from the writer process
+            pending.popleft().result()
+
     def close(self) -> None:
-        """Close the InfluxDB connection."""
+        """Flush pending points and close the InfluxDB connection."""
+        if self._pool:
+            try:
+                self._flush_buffer()
+                self._pool.submit(_close_client).result()
+            except Exception as e:
+                logger.error("Failed to flush writer process: %s", e)
+            self._pool.shutdown(wait=True)
+            self._pool = None
+            self._pending.clear()
         if self.client:
-            self.client.close()
+            close_influx_client(self.client)
             logger.info("InfluxDB connection closed")
 
 
@@ -134,13 +234,19 @@ def wait_for_influxdb(writer: InfluxWriter, max_retries: int = 30) -> bool:
     logger.info("Waiting for InfluxDB to be ready...")
 
     for attempt in range(max_retries):
-        if writer.connect():
+        # Cheap /ping probe before setting up the write API
+        if writer.ping() and writer.connect():
             return True
 
+        # Exponential backoff: retry quickly at first, capped at 30 seconds
+        delay = min(30.0, 0.1 * (2**attempt))
         logger.info(
-            f"Attempt {attempt + 1}/{max_retries} failed, retrying in 2 seconds..."
+            "Attempt %d/%d failed, retrying in %.1f seconds...",
+            attempt + 1,
+            max_retries,
+            delay,
         )
-        time.sleep(2)
+        time.sleep(delay)
 
     logger.error("InfluxDB failed to become ready after maximum retries")
     return False
@@ -161,18 +267,26 @@ def main() -> None:
     try:
         logger.info("Starting to write data every second. Press Ctrl+C to stop.")
 
+        # Schedule against absolute deadlines so write time does not add drift
+        next_tick = time.monotonic()
         while True:
             success = writer.write_dummy_data()
             if not success:
                 logger.warning("Failed to write data, continuing...")
 
-            time.sleep(1)  # Write once per second
+            next_tick += 1.0  # Write once per second
+            sleep_for = next_tick - time.monotonic()
+            if sleep_for > 0:
+                time.sleep(sleep_for)
+            else:
+                # Running behind: skip the missed tick instead of bursting
+                next_tick = time.monotonic()
 
     except KeyboardInterrupt:
         logger.info("Received interrupt signal, shutting down...")
 
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
 
     finally:
         writer.close()
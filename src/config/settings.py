@@ -5,22 +5,41 @@ Handles environment variables and configuration management.
 """
 
 import os
-from dataclasses import dataclass, field
-from typing import Dict, Optional
+import re
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+# KEY=value assignments, skipping comment lines
+_ENV_RE = re.compile(
+    r"(?m)^(?![ \t]*#)[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$"
+)
 
 
 def load_env_file(filepath: str = ".env") -> None:
     """Load environment variables from .env file."""
     if os.path.exists(filepath):
         with open(filepath, "r") as file:
-            for line in file:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    os.environ[key] = value
+            data = file.read()
+        os.environ.update(_ENV_RE.findall(data))
+
+
+# Snapshot of the environment used by the settings classes
+_ENV_CACHE: Dict[str, str] = {}
+
+
+def init_env_cache() -> None:
+    """Load the .env file and snapshot the environment for settings lookups."""
+    load_env_file()
+    _ENV_CACHE.update(os.environ)
+
 
+def _default(cls: type, name: str) -> Any:
+    """Get the declared default of a settings field."""
+    return next(f.default for f in fields(cls) if f.name == name)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class InfluxDBSettings:
     """InfluxDB connection settings."""
 
@@ -29,18 +48,45 @@ class InfluxDBSettings:
     org: str = "myorg"
     bucket: str = "mybucket"
 
+    # Points collected across cycles are written once either limit is reached
+    batch_size: int = 1000
+    max_batch_age: float = 1.0  # seconds
+
+    # Line protocol is highly repetitive, so gzip shrinks write payloads
+    enable_gzip: bool = True
+
+    # Optional Telegraf UDP listener for loss-tolerant system metrics
+    udp_host: Optional[str] = None
+    udp_port: int = 8094
+
     @classmethod
     def from_env(cls) -> "InfluxDBSettings":
         """Create settings from environment variables."""
         return cls(
-            url=os.getenv("INFLUX_URL", cls.url),
-            token=os.getenv("INFLUX_TOKEN", cls.token),
-            org=os.getenv("INFLUX_ORG", cls.org),
-            bucket=os.getenv("INFLUX_BUCKET", cls.bucket),
+            url=_ENV_CACHE.get("INFLUX_URL", _default(cls, "url")),
+            token=_ENV_CACHE.get("INFLUX_TOKEN", _default(cls, "token")),
+            org=_ENV_CACHE.get("INFLUX_ORG", _default(cls, "org")),
+            bucket=_ENV_CACHE.get("INFLUX_BUCKET", _default(cls, "bucket")),
+            batch_size=int(
+                _ENV_CACHE.get("INFLUX_BATCH_SIZE", str(_default(cls, "batch_size")))
+            ),
+            max_batch_age=float(
+                _ENV_CACHE.get(
+                    "INFLUX_MAX_BATCH_AGE", str(_default(cls, "max_batch_age"))
+                )
+            ),
+            enable_gzip=_ENV_CACHE.get(
+                "INFLUX_ENABLE_GZIP", str(_default(cls, "enable_gzip"))
+            ).lower()
+            == "true",
+            udp_host=_ENV_CACHE.get("INFLUX_UDP_HOST") or None,
+            udp_port=int(
+                _ENV_CACHE.get("INFLUX_UDP_PORT", str(_default(cls, "udp_port")))
+            ),
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HardwareSettings:
     """Hardware configuration settings."""
 
@@ -53,41 +99,59 @@ class HardwareSettings:
     i2c_bus: int = 1
 
     # GPIO settings
-    gpio_pins: Dict[str, int] = field(default_factory=dict)
+    gpio_pins: Dict[str, int] = field(
+        default_factory=lambda: {
+            "pump_control": 18,
+            "valve_control": 19,
+            "emergency_stop": 20,
+            "status_led": 21,
+        }
+    )
 
     # Sensor polling intervals (seconds)
     temperature_interval: float = 1.0
     pressure_interval: float = 1.0
     flow_interval: float = 0.5
 
-    def __post_init__(self) -> None:
-        if not self.gpio_pins:
-            self.gpio_pins = {
-                "pump_control": 18,
-                "valve_control": 19,
-                "emergency_stop": 20,
-                "status_led": 21,
-            }
+    # Pumps polled every collection cycle
+    pump_ids: Tuple[str, ...] = ("pump_001", "pump_002")
 
     @classmethod
     def from_env(cls) -> "HardwareSettings":
         """Create settings from environment variables."""
         return cls(
-            serial_port=os.getenv("SERIAL_PORT", cls.serial_port),
-            serial_baudrate=int(os.getenv("SERIAL_BAUDRATE", str(cls.serial_baudrate))),
-            serial_timeout=float(os.getenv("SERIAL_TIMEOUT", str(cls.serial_timeout))),
-            i2c_bus=int(os.getenv("I2C_BUS", str(cls.i2c_bus))),
+            serial_port=_ENV_CACHE.get("SERIAL_PORT", _default(cls, "serial_port")),
+            serial_baudrate=int(
+                _ENV_CACHE.get("SERIAL_BAUDRATE", str(_default(cls, "serial_baudrate")))
+            ),
+            serial_timeout=float(
+                _ENV_CACHE.get("SERIAL_TIMEOUT", str(_default(cls, "serial_timeout")))
+            ),
+            i2c_bus=int(_ENV_CACHE.get("I2C_BUS", str(_default(cls, "i2c_bus")))),
             temperature_interval=float(
-                os.getenv("TEMP_INTERVAL", str(cls.temperature_interval))
+                _ENV_CACHE.get(
+                    "TEMP_INTERVAL", str(_default(cls, "temperature_interval"))
+                )
             ),
             pressure_interval=float(
-                os.getenv("PRESSURE_INTERVAL", str(cls.pressure_interval))
+                _ENV_CACHE.get(
+                    "PRESSURE_INTERVAL", str(_default(cls, "pressure_interval"))
+                )
+            ),
+            flow_interval=float(
+                _ENV_CACHE.get("FLOW_INTERVAL", str(_default(cls, "flow_interval")))
+            ),
+            pump_ids=tuple(
+                pump_id.strip()
+                for pump_id in _ENV_CACHE.get(
+                    "PUMP_IDS", ",".join(_default(cls, "pump_ids"))
+                ).split(",")
+                if pump_id.strip()
             ),
-            flow_interval=float(os.getenv("FLOW_INTERVAL", str(cls.flow_interval))),
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LoggingSettings:
     """Logging configuration settings."""
 
@@ -101,15 +165,19 @@ class LoggingSettings:
     def from_env(cls) -> "LoggingSettings":
         """Create settings from environment variables."""
         return cls(
-            level=os.getenv("LOG_LEVEL", cls.level),
-            format=os.getenv("LOG_FORMAT", cls.format),
-            file_path=os.getenv("LOG_FILE_PATH"),
-            max_file_size=int(os.getenv("LOG_MAX_FILE_SIZE", str(cls.max_file_size))),
-            backup_count=int(os.getenv("LOG_BACKUP_COUNT", str(cls.backup_count))),
+            level=_ENV_CACHE.get("LOG_LEVEL", _default(cls, "level")),
+            format=_ENV_CACHE.get("LOG_FORMAT", _default(cls, "format")),
+            file_path=_ENV_CACHE.get("LOG_FILE_PATH"),
+            max_file_size=int(
+                _ENV_CACHE.get("LOG_MAX_FILE_SIZE", str(_default(cls, "max_file_size")))
+            ),
+            backup_count=int(
+                _ENV_CACHE.get("LOG_BACKUP_COUNT", str(_default(cls, "backup_count")))
+            ),
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Main application settings."""
 
@@ -126,26 +194,24 @@ class Settings:
     def from_env(cls) -> "Settings":
         """Create settings from environment variables."""
         # Load .env file first
-        load_env_file()
+        if not _ENV_CACHE:
+            init_env_cache()
 
         return cls(
             influxdb=InfluxDBSettings.from_env(),
             hardware=HardwareSettings.from_env(),
             logging=LoggingSettings.from_env(),
-            data_collection_enabled=os.getenv("DATA_COLLECTION_ENABLED", "true").lower()
+            data_collection_enabled=_ENV_CACHE.get(
+                "DATA_COLLECTION_ENABLED", "true"
+            ).lower()
             == "true",
-            mock_hardware=os.getenv("MOCK_HARDWARE", "false").lower() == "true",
-            debug_mode=os.getenv("DEBUG_MODE", "false").lower() == "true",
+            mock_hardware=_ENV_CACHE.get("MOCK_HARDWARE", "false").lower() == "true",
+            debug_mode=_ENV_CACHE.get("DEBUG_MODE", "false").lower() == "true",
         )
 
 
-# Global settings instance
-_settings: Optional[Settings] = None
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get the global settings instance."""
-    global _settings
-    if _settings is None:
-        _settings = Settings.from_env()
-    return _settings
+    init_env_cache()
+    return Settings.from_env()
@@ -1,6 +1,6 @@
 """Core application modules for the PumpTech system."""
 
 from .app import PumpTechApp
-from .logging_setup import setup_logging
+from .logging_setup import setup_logging, stop_logging
 
-__all__ = ["PumpTechApp", "setup_logging"]
+__all__ = ["PumpTechApp", "setup_logging", "stop_logging"]
@@ -5,13 +5,13 @@ Main application class for the PumpTech system.
 import logging
 import signal
 import sys
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from ..config import get_settings
 from ..data_collection import DataCollector
-from ..database import InfluxDBClient
+from ..database import InfluxDBClient, get_influx_client
 from ..hardware import MockHardware
-from .logging_setup import setup_logging
+from .logging_setup import setup_logging, stop_logging
 
 logger = logging.getLogger(__name__)
 
@@ -31,36 +31,38 @@ class PumpTechApp:
 
     def _signal_handler(self, signum: int, frame: Any) -> None:
         """Handle shutdown signals."""
-        logger.info(f"Received signal {signum}, shutting down...")
+        logger.info("Received signal %d, shutting down...", signum)
         self.shutdown()
 
-    def initialize(self) -> bool:
+    def initialize(
+        self, client_factory: Callable[[Any], Any] = get_influx_client
+    ) -> bool:
         """Initialize the application components."""
         logger.info("Initializing PumpTech application")
 
         try:
             # Initialize hardware interface
             if self.settings.mock_hardware:
-                hardware = MockHardware(self.settings.hardware.__dict__)
+                hardware = MockHardware(self.settings.hardware)
                 logger.info("Using mock hardware for testing")
             else:
                 # In a real implementation, initialize actual hardware here
                 logger.warning(
                     "Real hardware not implemented, falling back to mock hardware"
                 )
-                hardware = MockHardware(self.settings.hardware.__dict__)
+                hardware = MockHardware(self.settings.hardware)
 
             # Initialize database client
-            db_client = InfluxDBClient(self.settings)
+            db_client = InfluxDBClient(self.settings, client_factory=client_factory)
 
-            # Initialize data collector
+            # Initialize data collector; it builds the batch buffer from settings
             self.data_collector = DataCollector(hardware, db_client)
 
             logger.info("Application initialized successfully")
             return True
 
         except Exception as e:
-            logger.error(f"Failed to initialize application: {e}")
+            logger.error("Failed to initialize application: %s", e)
             return False
 
     def start(self) -> bool:
@@ -84,7 +86,7 @@ class PumpTechApp:
             return True
 
         except Exception as e:
-            logger.error(f"Failed to start application: {e}")
+            logger.error("Failed to start application: %s", e)
             return False
 
     def run(self, collection_interval: float = 1.0) -> None:
@@ -95,7 +97,8 @@ class PumpTechApp:
 
         try:
             logger.info(
-                f"Running continuous data collection (interval: {collection_interval}s)"
+                "Running continuous data collection (interval: %ss)",
+                collection_interval,
             )
             logger.info("Press Ctrl+C to stop")
 
@@ -106,7 +109,7 @@ class PumpTechApp:
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt")
         except Exception as e:
-            logger.error(f"Unexpected error during execution: {e}")
+            logger.error("Unexpected error during execution: %s", e)
         finally:
             self.shutdown()
 
@@ -117,8 +120,10 @@ class PumpTechApp:
 
         try:
             logger.info("Running single data collection cycle")
+            # Queuing the cycle is not enough; wait until it is written
             success = (
                 self.data_collector.collect_and_store_all()
+                and self.data_collector.flush()
                 if self.data_collector is not None
                 else False
             )
@@ -131,7 +136,7 @@ class PumpTechApp:
             return success
 
         except Exception as e:
-            logger.error(f"Error during single collection: {e}")
+            logger.error("Error during single collection: %s", e)
             return False
         finally:
             self.shutdown()
@@ -164,6 +169,7 @@ class PumpTechApp:
             self.data_collector.stop()
 
         logger.info("Application shutdown complete")
+        stop_logging()
 
     def __enter__(self) -> "PumpTechApp":
         """Context manager entry."""
@@ -2,14 +2,51 @@
 Logging configuration for the PumpTech system.
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from ..config import get_settings
 
+# Background listener that owns the real handlers
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _IsoFormatter(logging.Formatter):
+    """Formatter that renders asctime as a local timestamp in datefmt."""
+
+    def __init__(self, fmt: Optional[str] = None, datefmt: str = "%Y-%m-%dT%H:%M:%S"):
+        super().__init__(fmt, datefmt)
+        # UTC offset looked up once per minute, so records skip the localtime()
+        # tz lookup but still follow DST changes, including ones that do not
+        # fall on a UTC hour boundary
+        self._offset_minute = -1
+        self._utc_offset = 0
+        self._cached: Tuple[int, str] = (-1, "")
+
+    def formatTime(
+        self, record: logging.LogRecord, datefmt: Optional[str] = None
+    ) -> str:
+        """Format the record time, reusing the string within the same second."""
+        second = int(record.created)
+        cached_second, cached_time = self._cached
+        if second != cached_second:
+            minute = second // 60
+            if minute != self._offset_minute:
+                self._utc_offset = time.localtime(second).tm_gmtoff
+                self._offset_minute = minute
+            cached_time = time.strftime(
+                datefmt or self.default_time_format,
+                time.gmtime(second + self._utc_offset),
+            )
+            self._cached = (second, cached_time)
+        return cached_time
+
 
 def setup_logging(
     log_file: Optional[str] = None, log_level: Optional[str] = None
@@ -23,6 +60,12 @@ def setup_logging(
     """
     settings = get_settings().logging
 
+    # Skip per-record thread/process lookups; the default format does not use them
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging.raiseExceptions = False
+
     # Use provided values or fall back to settings
     if log_level is None:
         log_level = settings.level
@@ -33,21 +76,24 @@ def setup_logging(
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
 
     # Create formatter
-    formatter = logging.Formatter(settings.format)
+    formatter = _IsoFormatter(settings.format)
 
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
 
     # Remove existing handlers
+    stop_logging()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
 
+    handlers: List[logging.Handler] = []
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(numeric_level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # File handler (if specified)
     if log_file:
@@ -59,7 +105,21 @@ def setup_logging(
         )
         file_handler.setLevel(numeric_level)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # Loggers only enqueue records; a background thread does the actual I/O
+    global _listener
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+    # Drain the queue on every exit path, including sys.exit() after a failed
+    # start; registering again replaces the earlier registration
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
 
     # Set specific logger levels for third-party libraries
     logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -67,4 +127,27 @@ def setup_logging(
 
     # Log the configuration
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging configured: level={log_level}, file={log_file}")
+    logger.info("Logging configured: level=%s, file=%s", log_level, log_file)
+
+
+def stop_logging() -> None:
+    """
+    Stop the background logging thread after it drains queued records.
+
+    The real handlers are attached directly to the root logger afterwards, so
+    records logged during the rest of shutdown are still written.
+    """
+    global _listener
+    if _listener is None:
+        return
+
+    _listener.stop()
+
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root_logger.removeHandler(handler)
+    for handler in _listener.handlers:
+        root_logger.addHandler(handler)
+
+    _listener = None
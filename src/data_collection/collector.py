@@ -5,17 +5,26 @@ Handles collecting data from hardware and storing it in InfluxDB.
 """
 
 import logging
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence
 
 from ..config import get_settings
-from ..database import InfluxDBClient
-from ..database.models import AlarmEvent, PumpReading, SensorReading, SystemMetric
-from ..hardware import HardwareInterface, MockHardware
+from ..database import BatchBuffer, InfluxDBClient
+from ..database.models import SystemMetric
+from ..hardware import HardwareError, HardwareInterface, MockHardware
 
 logger = logging.getLogger(__name__)
 
+# Host tag for the collector's own system metrics
+METRICS_HOST = "pumptech_system"
+
+# Failures a collection cycle recovers from; anything else is a bug
+HARDWARE_ERRORS = (HardwareError, OSError)
+
 
 class DataCollector:
     """Main data collection service."""
@@ -24,6 +33,7 @@ class DataCollector:
         self,
         hardware: Optional[HardwareInterface] = None,
         db_client: Optional[InfluxDBClient] = None,
+        batch_buffer: Optional[BatchBuffer] = None,
     ):
         """Initialize the data collector."""
         self.settings = get_settings()
@@ -31,25 +41,66 @@ class DataCollector:
         # Initialize hardware interface
         if hardware is None:
             if self.settings.mock_hardware:
-                hardware = MockHardware(self.settings.hardware.__dict__)
+                hardware = MockHardware(self.settings.hardware)
             else:
                 # In a real implementation, you would initialize actual hardware here
                 logger.warning("Real hardware not implemented, using mock hardware")
-                hardware = MockHardware(self.settings.hardware.__dict__)
+                hardware = MockHardware(self.settings.hardware)
 
         self.hardware = hardware
 
         # Initialize database client
         if db_client is None:
-            db_client = InfluxDBClient()
+            db_client = InfluxDBClient(self.settings)
 
         self.db_client = db_client
 
+        # Coalesce writes across collection cycles into larger batches
+        if batch_buffer is None:
+            batch_buffer = BatchBuffer(
+                db_client,
+                max_points=self.settings.influxdb.batch_size,
+                max_age_s=self.settings.influxdb.max_batch_age,
+            )
+
+        self.batch_buffer = batch_buffer
+
+        # In real implementation, you'd get this from hardware discovery
+        self.pump_ids = self.settings.hardware.pump_ids
+
+        # Pump reads are I/O bound, so issue them concurrently; created on
+        # first use and shut down by stop()
+        self._pump_pool: Optional[ThreadPoolExecutor] = None
+
+        # Collected batches are written by a separate thread; the bound makes a
+        # slow database block collection instead of growing memory
+        self._write_queue: "queue.Queue[Optional[List[Any]]]" = queue.Queue(maxsize=8)
+        self._writer_thread: Optional[threading.Thread] = None
+
+        # Batches the writer failed to store since the last flush()
+        self._store_failures = 0
+
         # Collection state
         self.running = False
         self.last_collection_time: Optional[datetime] = None
         self.collection_count = 0
         self.error_count = 0
+        # The writer thread counts store errors alongside the collection thread
+        self._error_lock = threading.Lock()
+        # Database write failures already added to error_count
+        self._seen_write_errors = 0
+
+    def _count_error(self) -> None:
+        """Increment the error count from any thread."""
+        with self._error_lock:
+            self.error_count += 1
+
+    def _count_write_errors(self) -> None:
+        """Add write failures the database client reported since the last check."""
+        with self._error_lock:
+            write_errors = self.db_client.write_error_count
+            self.error_count += write_errors - self._seen_write_errors
+            self._seen_write_errors = write_errors
 
     def start(self) -> bool:
         """Start the data collection service."""
@@ -58,7 +109,7 @@ class DataCollector:
         # Connect to hardware
         if not self.hardware.connect():
             logger.error(
-                f"Failed to connect to hardware: {self.hardware.get_last_error()}"
+                "Failed to connect to hardware: %s", self.hardware.get_last_error()
             )
             return False
 
@@ -68,6 +119,13 @@ class DataCollector:
             return False
 
         self.running = True
+
+        if self._writer_thread is None:
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop, name="influx-writer", daemon=True
+            )
+            self._writer_thread.start()
+
         logger.info("Data collection service started successfully")
         return True
 
@@ -76,110 +134,154 @@ class DataCollector:
         logger.info("Stopping data collection service")
         self.running = False
 
+        # Let the writer drain batches that are already queued
+        if self._writer_thread is not None:
+            self._write_queue.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
+
         if self.hardware:
             self.hardware.disconnect()
 
+        self.batch_buffer.flush()
+
         if self.db_client:
+            # disconnect() drains the write API's queue as it closes it
             self.db_client.disconnect()
+            self._count_write_errors()
+
+        if self._pump_pool is not None:
+            self._pump_pool.shutdown(wait=True)
+            self._pump_pool = None
 
         logger.info("Data collection service stopped")
 
-    def collect_sensor_data(self) -> List[SensorReading]:
-        """Collect data from all sensors."""
+    def collect_sensor_data(
+        self, out: Optional[List[Any]] = None, timestamp: Optional[datetime] = None
+    ) -> List[Any]:
+        """Collect data from all sensors, appending to out if given."""
+        if out is None:
+            out = []
+
         if not self.hardware.is_connected():
             logger.error("Hardware not connected")
-            return []
+            return out
 
         try:
-            readings = self.hardware.read_all_sensors()
-            logger.debug(f"Collected {len(readings)} sensor readings")
-            return readings
-
-        except Exception as e:
-            logger.error(f"Error collecting sensor data: {e}")
-            self.error_count += 1
-            return []
+            readings = self.hardware.read_all_sensors(timestamp)
+            out.extend(readings)
+            logger.debug("Collected %d sensor readings", len(readings))
+            return out
+
+        except HARDWARE_ERRORS as e:
+            logger.error("Error collecting sensor data: %s", e)
+            self._count_error()
+            return out
+
+    def collect_pump_data(
+        self, out: Optional[List[Any]] = None, timestamp: Optional[datetime] = None
+    ) -> List[Any]:
+        """Collect data from all pumps, appending to out if given."""
+        if out is None:
+            out = []
 
-    def collect_pump_data(self) -> List[PumpReading]:
-        """Collect data from all pumps."""
         if not self.hardware.is_connected():
             logger.error("Hardware not connected")
-            return []
+            return out
 
-        pump_readings = []
+        start = len(out)
 
         try:
             # Get system status to find available pumps
             # status = self.hardware.get_system_status()  # TODO: Use for discovery
 
-            # For mock hardware, we know the pump IDs
-            # In real implementation, you'd get this from hardware discovery
-            pump_ids = ["pump_001", "pump_002"]  # This should come from hardware config
+            pump_ids = self.pump_ids
+            if not pump_ids:
+                return out
+
+            # Prefer a single bulk read when the hardware supports one
+            read_all_pumps = getattr(self.hardware, "read_all_pumps", None)
+            if read_all_pumps is not None:
+                out.extend(read_all_pumps(pump_ids, timestamp))
+                logger.debug("Collected %d pump readings", len(out) - start)
+                return out
+
+            if self._pump_pool is None:
+                self._pump_pool = ThreadPoolExecutor(
+                    max_workers=max(1, min(8, len(pump_ids))),
+                    thread_name_prefix="pump-read",
+                )
+
+            futures = [
+                self._pump_pool.submit(self.hardware.get_pump_data, pump_id, timestamp)
+                for pump_id in pump_ids
+            ]
 
-            for pump_id in pump_ids:
+            for pump_id, future in zip(pump_ids, futures):
                 try:
-                    reading = self.hardware.get_pump_data(pump_id)
+                    reading = future.result()
                     if reading:
-                        pump_readings.append(reading)
-                except Exception as e:
-                    logger.warning(f"Failed to read pump {pump_id}: {e}")
+                        out.append(reading)
+                except HARDWARE_ERRORS as e:
+                    logger.warning("Failed to read pump %s: %s", pump_id, e)
 
-            logger.debug(f"Collected {len(pump_readings)} pump readings")
-            return pump_readings
+            logger.debug("Collected %d pump readings", len(out) - start)
+            return out
 
-        except Exception as e:
-            logger.error(f"Error collecting pump data: {e}")
-            self.error_count += 1
-            return []
+        except HARDWARE_ERRORS as e:
+            logger.error("Error collecting pump data: %s", e)
+            self._count_error()
+            del out[start:]
+            return out
 
-    def collect_system_metrics(self) -> List[SystemMetric]:
-        """Collect system performance metrics."""
-        metrics = []
+    def collect_system_metrics(
+        self, out: Optional[List[Any]] = None, timestamp: Optional[datetime] = None
+    ) -> List[Any]:
+        """Collect system performance metrics, appending to out if given."""
+        if out is None:
+            out = []
+
+        start = len(out)
 
         try:
             # Get hardware system status
             if self.hardware.is_connected():
                 status = self.hardware.get_system_status()
-
-                # Convert status to metrics
-                metrics.append(
-                    SystemMetric(
-                        host="pumptech_system",
-                        component="hardware",
-                        metric_name="sensors_healthy",
-                        metric_value=float(status.get("sensors", {}).get("healthy", 0)),
-                        metric_unit="count",
-                        additional_fields={
-                            "total_sensors": status.get("sensors", {}).get("total", 0),
-                            "unhealthy_sensors": status.get("sensors", {}).get(
-                                "unhealthy", 0
-                            ),
-                        },
-                    )
-                )
-
-                metrics.append(
+                sensors = status.get("sensors", {})
+                pumps = status.get("pumps", {})
+
+                # One multi-field point per series: the cycle shares a single
+                # timestamp, and InfluxDB merges points with the same series and
+                # time, so separate hardware points would overwrite each other
+                healthy = sensors.get("healthy", 0)
+                out.append(
                     SystemMetric(
-                        host="pumptech_system",
+                        host=METRICS_HOST,
                         component="hardware",
-                        metric_name="pumps_running",
-                        metric_value=float(status.get("pumps", {}).get("running", 0)),
+                        metric_name="hardware_status",
+                        metric_value=float(healthy),
                         metric_unit="count",
+                        timestamp=timestamp,
                         additional_fields={
-                            "total_pumps": status.get("pumps", {}).get("total", 0),
-                            "stopped_pumps": status.get("pumps", {}).get("stopped", 0),
+                            "sensors_healthy": healthy,
+                            "total_sensors": sensors.get("total", 0),
+                            "unhealthy_sensors": sensors.get("unhealthy", 0),
+                            "pumps_running": pumps.get("running", 0),
+                            "total_pumps": pumps.get("total", 0),
+                            "stopped_pumps": pumps.get("stopped", 0),
                         },
                     )
                 )
 
             # Add collection service metrics
-            metrics.append(
+            out.append(
                 SystemMetric(
-                    host="pumptech_system",
+                    host=METRICS_HOST,
                     component="data_collector",
                     metric_name="collection_count",
                     metric_value=float(self.collection_count),
                     metric_unit="count",
+                    timestamp=timestamp,
                     additional_fields={
                         "error_count": self.error_count,
                         "running": self.running,
@@ -187,116 +289,164 @@ class DataCollector:
                 )
             )
 
-            logger.debug(f"Collected {len(metrics)} system metrics")
-            return metrics
+            logger.debug("Collected %d system metrics", len(out) - start)
+            return out
 
-        except Exception as e:
-            logger.error(f"Error collecting system metrics: {e}")
-            self.error_count += 1
-            return []
+        except HARDWARE_ERRORS as e:
+            logger.error("Error collecting system metrics: %s", e)
+            self._count_error()
+            del out[start:]
+            return out
+
+    def collect_alarms(self, out: Optional[List[Any]] = None) -> List[Any]:
+        """Collect current alarms from hardware, appending to out if given."""
+        if out is None:
+            out = []
 
-    def collect_alarms(self) -> List[AlarmEvent]:
-        """Collect current alarms from hardware."""
         if not self.hardware.is_connected():
-            return []
+            return out
 
         try:
             alarms = self.hardware.get_alarms()
-            logger.debug(f"Collected {len(alarms)} alarms")
-            return alarms
+            out.extend(alarms)
+            logger.debug("Collected %d alarms", len(alarms))
+            return out
 
-        except Exception as e:
-            logger.error(f"Error collecting alarms: {e}")
-            self.error_count += 1
-            return []
+        except HARDWARE_ERRORS as e:
+            logger.error("Error collecting alarms: %s", e)
+            self._count_error()
+            return out
 
-    def store_data(self, data_points: List[Any]) -> bool:
+    def store_data(self, data_points: Sequence[Any]) -> bool:
         """Store collected data points in InfluxDB."""
         if not data_points:
             return True
 
-        if not self.db_client.is_connected():
+        if not self.db_client.connected:
             logger.error("Database not connected")
             return False
 
-        try:
-            success = self.db_client.write_batch(data_points)
-            if success:
-                logger.debug(f"Stored {len(data_points)} data points")
-            else:
-                logger.error("Failed to store data points")
-                self.error_count += 1
-
-            return success
-
-        except Exception as e:
-            logger.error(f"Error storing data: {e}")
-            self.error_count += 1
-            return False
+        # Written by the buffer once it is full or old enough; write errors
+        # are handled by the database client
+        success = self.batch_buffer.add(data_points)
+        if success:
+            logger.debug("Stored %d data points", len(data_points))
+        else:
+            logger.error("Failed to store data points")
+            self._count_error()
+
+        return success
+
+    def _writer_loop(self) -> None:
+        """Store queued batches until stop() enqueues the None sentinel."""
+        while True:
+            batch = self._write_queue.get()
+            if batch is None:
+                self._write_queue.task_done()
+                return
+
+            # Keep the writer alive so a bad batch cannot stall collection
+            try:
+                if not self.store_data(batch):
+                    self._store_failures += 1
+            except Exception:
+                logger.exception("Error storing data")
+                self._count_error()
+                self._store_failures += 1
+            finally:
+                # The database client reports failed writes asynchronously
+                self._count_write_errors()
+                self._write_queue.task_done()
+
+    def flush(self) -> bool:
+        """
+        Write everything collected so far.
+
+        Waits for the writer thread to store queued batches, then writes the
+        batch buffer and waits for the database client to send it. Returns
+        False if any batch failed to store or write since the last flush.
+        """
+        if self._writer_thread is not None:
+            self._write_queue.join()
+
+        failures, self._store_failures = self._store_failures, 0
+        # Drain both stages even if the first one failed
+        buffered = self.batch_buffer.flush()
+        written = self.db_client.flush()
+        self._count_write_errors()
+        return buffered and written and failures == 0
 
     def collect_and_store_all(self) -> bool:
-        """Collect all data and store it."""
+        """
+        Collect all data and queue it for the writer thread.
+
+        Returns True once the cycle's data is queued, not when it is written;
+        call flush() to wait for the write.
+        """
         if not self.running:
             return False
 
-        start_time = time.time()
-        all_data: List[Union[SensorReading, PumpReading, SystemMetric, AlarmEvent]] = []
-
-        try:
-            # Collect sensor data
-            sensor_readings = self.collect_sensor_data()
-            all_data.extend(sensor_readings)
-
-            # Collect pump data
-            pump_readings = self.collect_pump_data()
-            all_data.extend(pump_readings)
+        start_time = time.perf_counter()
+        all_data: List[Any] = []
 
-            # Collect system metrics
-            system_metrics = self.collect_system_metrics()
-            all_data.extend(system_metrics)
+        # Every point of the cycle shares one timestamp
+        now = datetime.utcnow()
 
-            # Collect alarms
-            alarms = self.collect_alarms()
-            all_data.extend(alarms)
+        try:
+            # Each collector appends straight into the shared batch
+            self.collect_sensor_data(out=all_data, timestamp=now)
+            self.collect_pump_data(out=all_data, timestamp=now)
+            self.collect_system_metrics(out=all_data, timestamp=now)
+            self.collect_alarms(out=all_data)
 
-            # Store all data
-            success = self.store_data(all_data)
+            # The writer thread takes ownership of the batch
+            self._write_queue.put(all_data)
 
             # Update collection statistics
             self.collection_count += 1
-            self.last_collection_time = datetime.utcnow()
+            self.last_collection_time = now
 
-            collection_time = time.time() - start_time
+            collection_time = time.perf_counter() - start_time
             logger.info(
-                f"Collection cycle completed: {len(all_data)} data points "
-                f"in {collection_time:.2f}s (success: {success})"
+                "Collection cycle completed: %d data points in %.2fs",
+                len(all_data),
+                collection_time,
             )
-
-            return success
+            return True
 
         except Exception as e:
-            logger.error(f"Error in collection cycle: {e}")
-            self.error_count += 1
+            logger.error("Error in collection cycle: %s", e)
+            self._count_error()
             return False
 
     def run_continuous(self, interval: float = 1.0) -> None:
         """Run continuous data collection."""
-        logger.info(f"Starting continuous data collection (interval: {interval}s)")
+        logger.info("Starting continuous data collection (interval: %ss)", interval)
 
         if not self.start():
             logger.error("Failed to start data collection service")
             return
 
         try:
+            # Schedule against absolute deadlines so collection time does not
+            # add drift to the sampling period
+            deadline = time.monotonic()
             while self.running:
                 self.collect_and_store_all()
-                time.sleep(interval)
+
+                deadline += interval
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Running behind: skip the missed deadlines instead of bursting
+                    deadline = time.monotonic()
 
         except KeyboardInterrupt:
             logger.info("Received interrupt signal")
 
         except Exception as e:
-            logger.error(f"Unexpected error in continuous collection: {e}")
+            logger.error("Unexpected error in continuous collection: %s", e)
 
         finally:
             self.stop()
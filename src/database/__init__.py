@@ -1,6 +1,14 @@
 """Database management for the PumpTech system."""
 
-from .influx_client import InfluxDBClient
+from .batch_buffer import BatchBuffer
+from .influx_client import InfluxDBClient, close_influx_client, get_influx_client
 from .models import SensorReading, SystemMetric
 
-__all__ = ["InfluxDBClient", "SensorReading", "SystemMetric"]
+__all__ = [
+    "BatchBuffer",
+    "InfluxDBClient",
+    "SensorReading",
+    "SystemMetric",
+    "close_influx_client",
+    "get_influx_client",
+]
@@ -0,0 +1,72 @@
+"""
+Write batching for the PumpTech system.
+
+Accumulates data points across collection cycles so they reach InfluxDB in
+fewer, larger requests.
+"""
+
+import logging
+import threading
+from typing import Any, Iterable, List, Optional
+
+from .influx_client import InfluxDBClient
+
+logger = logging.getLogger(__name__)
+
+
+class BatchBuffer:
+    """Buffers data points and writes them once the batch is full or old enough."""
+
+    def __init__(
+        self,
+        db_client: InfluxDBClient,
+        max_points: int = 1000,
+        max_age_s: float = 1.0,
+    ):
+        """Initialize the batch buffer."""
+        self.db_client = db_client
+        self.max_points = max_points
+        self.max_age_s = max_age_s
+        self._points: List[Any] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def __len__(self) -> int:
+        """Number of data points waiting to be written."""
+        return len(self._points)
+
+    def add(self, data_points: Iterable[Any]) -> bool:
+        """Add data points, writing the batch immediately if it is full."""
+        with self._lock:
+            self._points.extend(data_points)
+
+            if len(self._points) >= self.max_points:
+                return self._flush_locked()
+
+            # Make sure a partial batch is written after max_age_s
+            if self._points and self._timer is None:
+                self._timer = threading.Timer(self.max_age_s, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        return True
+
+    def flush(self) -> bool:
+        """Write all buffered data points now."""
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> bool:
+        """Write buffered data points. Caller must hold the lock."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._points:
+            return True
+
+        points, self._points = self._points, []
+        success = self.db_client.write_batch(points)
+        if not success:
+            logger.error("Failed to write batch of %d data points", len(points))
+        return success
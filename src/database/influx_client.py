@@ -5,14 +5,16 @@ Refactored and improved version of the original influx-writer.py
 """
 
 import logging
+import socket
+import threading
 import time
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
 
 try:
     from influxdb_client import InfluxDBClient as InfluxClient
-    from influxdb_client import Point
+    from influxdb_client import WritePrecision
     from influxdb_client.client.exceptions import InfluxDBError
-    from influxdb_client.client.write_api import SYNCHRONOUS
+    from influxdb_client.client.write_api import WriteOptions, WriteType
 except ImportError:
     print("ERROR: influxdb-client not installed. Run: uv add influxdb-client")
     exit(1)
@@ -22,27 +24,92 @@ from .models import AlarmEvent, PumpReading, SensorReading, SystemMetric
 
 logger = logging.getLogger(__name__)
 
+# Shared client so every component reuses the same HTTP connection pool
+_CLIENT: Optional[InfluxClient] = None
+
+# Writes are queued and flushed by the client in background threads
+WRITE_OPTIONS = WriteOptions(
+    write_type=WriteType.batching,
+    batch_size=5_000,
+    flush_interval=2_000,
+    jitter_interval=500,
+    retry_interval=5_000,
+)
+
+# Keep UDP datagrams below the maximum IPv4 payload
+MAX_DATAGRAM_SIZE = 65_000
+
+
+def get_influx_client(settings: Any = None) -> InfluxClient:
+    """Get the shared InfluxDB client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        if settings is None:
+            settings = get_settings().influxdb
+
+        _CLIENT = InfluxClient(
+            url=settings.url,
+            token=settings.token,
+            org=settings.org,
+            timeout=10_000,
+            enable_gzip=settings.enable_gzip,
+        )
+    return _CLIENT
+
+
+def close_influx_client(client: InfluxClient) -> None:
+    """Close a client, releasing the shared instance if it is the one closed."""
+    global _CLIENT
+    client.close()
+    if client is _CLIENT:
+        _CLIENT = None
+
 
 class InfluxDBClient:
     """Enhanced InfluxDB client with better error handling and data models."""
 
-    def __init__(self, settings: Any = None):
+    def __init__(
+        self,
+        settings: Any = None,
+        client_factory: Callable[[Any], InfluxClient] = get_influx_client,
+    ):
         """Initialize the InfluxDB client."""
         if settings is None:
             settings = get_settings()
 
         self.settings = settings.influxdb
+        # Settings are frozen, so the bucket can be read once for every write
+        self._bucket = self.settings.bucket
+        self._client_factory = client_factory
         self.client: Optional[InfluxClient] = None
         self.write_api: Any = None
         self.query_api: Any = None
-        self._connected = False
+
+        # True only while client and write_api are usable; checked on every write
+        self.connected = False
+
+        # Batches the background writer failed to deliver, counted by the
+        # error callback; flush() reports failures since the previous flush
+        self.write_error_count = 0
+        self._flushed_error_count = 0
+        self._write_error_lock = threading.Lock()
+
+        # System metrics go to Telegraf over UDP when a listener is configured
+        self._udp_addr = (
+            (self.settings.udp_host, self.settings.udp_port)
+            if self.settings.udp_host
+            else None
+        )
+        self._udp_sock: Optional[socket.socket] = None
 
     def connect(self) -> bool:
         """Connect to InfluxDB and initialize APIs."""
+        # start() may run more than once; keep the existing write pipeline
+        if self.connected:
+            return True
+
         try:
-            self.client = InfluxClient(
-                url=self.settings.url, token=self.settings.token, org=self.settings.org
-            )
+            self.client = self._client_factory(self.settings)
 
             # Test connection
             ready = self.client.ready()
@@ -50,99 +117,122 @@ class InfluxDBClient:
                 logger.error("InfluxDB is not ready")
                 return False
 
-            # Initialize APIs
-            self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
+            # Initialize APIs, closing any batching API left by a failed attempt
+            if self.write_api is not None:
+                self.write_api.close()
+            self.write_api = self._open_write_api()
             self.query_api = self.client.query_api()
 
-            self._connected = True
-            logger.info(f"Successfully connected to InfluxDB at {self.settings.url}")
+            self.connected = True
+            logger.info("Successfully connected to InfluxDB at %s", self.settings.url)
             return True
 
         except Exception as e:
-            logger.error(f"Failed to connect to InfluxDB: {e}")
-            self._connected = False
+            logger.error("Failed to connect to InfluxDB: %s", e)
+            self.connected = False
             return False
 
+    def _open_write_api(self) -> Any:
+        """Create a batching write API on the current client."""
+        return self.client.write_api(  # type: ignore[union-attr]
+            write_options=WRITE_OPTIONS, error_callback=self._on_write_error
+        )
+
+    def _on_write_error(self, conf: Any, data: Any, exception: Exception) -> None:
+        """Log and count a batch the background writer failed to deliver."""
+        bucket = conf[0]
+        logger.error("Failed to write batch to bucket %s: %s", bucket, exception)
+        with self._write_error_lock:
+            self.write_error_count += 1
+
+    def flush(self) -> bool:
+        """
+        Write all points queued by the batching write API.
+
+        Returns False if any batch failed to write since the last flush.
+        """
+        if self.write_api is not None:
+            # WriteApi.flush() is a no-op; closing the API drains its queue
+            self.write_api.close()
+            self.write_api = self._open_write_api() if self.client else None
+
+        with self._write_error_lock:
+            failed = self.write_error_count != self._flushed_error_count
+            self._flushed_error_count = self.write_error_count
+        return not failed
+
     def is_connected(self) -> bool:
         """Check if client is connected to InfluxDB."""
-        return self._connected and self.client is not None
+        return self.connected
 
     def disconnect(self) -> None:
-        """Close the InfluxDB connection."""
+        """Write queued points and close the InfluxDB connection."""
+        self.connected = False
+
+        if self.write_api is not None:
+            self.write_api.close()
+            self.write_api = None
+
+        if self._udp_sock is not None:
+            self._udp_sock.close()
+            self._udp_sock = None
+
         if self.client:
-            self.client.close()
-            self._connected = False
+            close_influx_client(self.client)
+            self.client = None
             logger.info("InfluxDB connection closed")
 
     def write_sensor_reading(self, reading: SensorReading) -> bool:
         """Write a single sensor reading to InfluxDB."""
-        if not self.is_connected():
+        if not self.connected:
             logger.error("Not connected to InfluxDB")
             return False
 
         try:
-            point_data = reading.to_influx_point()
-            point = Point(point_data["measurement"])
-
-            # Add tags
-            for tag_key, tag_value in point_data["tags"].items():
-                point = point.tag(tag_key, tag_value)
-
-            # Add fields
-            for field_key, field_value in point_data["fields"].items():
-                point = point.field(field_key, field_value)
-
-            # Set timestamp
-            point = point.time(point_data["time"])
-
-            self.write_api.write(bucket=self.settings.bucket, record=point)
+            self.write_api.write(
+                bucket=self._bucket,
+                record=reading.to_line_protocol(),
+                write_precision=WritePrecision.NS,
+            )
 
             logger.debug(
-                f"Written sensor reading: {reading.sensor_id} = {reading.value}"
+                "Written sensor reading: %s = %s", reading.sensor_id, reading.value
             )
             return True
 
         except InfluxDBError as e:
-            logger.error(f"InfluxDB error writing sensor reading: {e}")
+            logger.error("InfluxDB error writing sensor reading: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error writing sensor reading: {e}")
+            logger.error("Unexpected error writing sensor reading: %s", e)
             return False
 
     def write_system_metric(self, metric: SystemMetric) -> bool:
         """Write a single system metric to InfluxDB."""
-        if not self.is_connected():
+        if not self.connected:
             logger.error("Not connected to InfluxDB")
             return False
 
         try:
-            point_data = metric.to_influx_point()
-            point = Point(point_data["measurement"])
-
-            # Add tags
-            for tag_key, tag_value in point_data["tags"].items():
-                point = point.tag(tag_key, tag_value)
-
-            # Add fields
-            for field_key, field_value in point_data["fields"].items():
-                point = point.field(field_key, field_value)
-
-            # Set timestamp
-            point = point.time(point_data["time"])
-
-            self.write_api.write(bucket=self.settings.bucket, record=point)
+            self.write_api.write(
+                bucket=self._bucket,
+                record=metric.to_line_protocol(),
+                write_precision=WritePrecision.NS,
+            )
 
             logger.debug(
-                f"Written system metric: {metric.component}.{metric.metric_name} = "
-                f"{metric.metric_value}"
+                "Written system metric: %s.%s = %s",
+                metric.component,
+                metric.metric_name,
+                metric.metric_value,
             )
             return True
 
         except InfluxDBError as e:
-            logger.error(f"InfluxDB error writing system metric: {e}")
+            logger.error("InfluxDB error writing system metric: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error writing system metric: {e}")
+            logger.error("Unexpected error writing system metric: %s", e)
             return False
 
     def write_batch(
@@ -150,7 +240,7 @@ class InfluxDBClient:
         data_points: List[Union[SensorReading, SystemMetric, PumpReading, AlarmEvent]],
     ) -> bool:
         """Write multiple data points in a batch."""
-        if not self.is_connected():
+        if not self.connected:
             logger.error("Not connected to InfluxDB")
             return False
 
@@ -159,39 +249,66 @@ class InfluxDBClient:
             return True
 
         try:
-            points = []
-
-            for data_point in data_points:
-                point_data = data_point.to_influx_point()
-                point = Point(point_data["measurement"])
-
-                # Add tags
-                for tag_key, tag_value in point_data["tags"].items():
-                    point = point.tag(tag_key, tag_value)
+            # Serialize straight to line protocol instead of building Points
+            if self._udp_addr is None:
+                lines = [data_point.to_line_protocol() for data_point in data_points]
+            else:
+                # Loss-tolerant system metrics bypass the HTTP write path
+                lines = []
+                udp_lines = []
+                for data_point in data_points:
+                    if isinstance(data_point, SystemMetric):
+                        udp_lines.append(data_point.to_line_protocol())
+                    else:
+                        lines.append(data_point.to_line_protocol())
+                self.write_udp(udp_lines)
+
+            if lines:
+                self.write_api.write(
+                    bucket=self._bucket,
+                    record=lines,
+                    write_precision=WritePrecision.NS,
+                )
+
+            # Delivery failures surface through write_error_count and flush()
+            logger.info("Queued batch of %d data points", len(data_points))
+            return True
 
-                # Add fields
-                for field_key, field_value in point_data["fields"].items():
-                    point = point.field(field_key, field_value)
+        except InfluxDBError as e:
+            logger.error("InfluxDB error writing batch: %s", e)
+            return False
+        except Exception as e:
+            logger.error("Unexpected error writing batch: %s", e)
+            return False
 
-                # Set timestamp
-                point = point.time(point_data["time"])
-                points.append(point)
+    def write_udp(self, lines: Sequence[str]) -> bool:
+        """Send line protocol records to the Telegraf UDP listener."""
+        if self._udp_addr is None or not lines:
+            return False
 
-            self.write_api.write(bucket=self.settings.bucket, record=points)
+        if self._udp_sock is None:
+            self._udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
-            logger.info(f"Written batch of {len(points)} data points")
+        try:
+            # Pack as many lines per datagram as fit
+            datagram = b""
+            for line in lines:
+                data = line.encode()
+                if datagram and len(datagram) + len(data) + 1 > MAX_DATAGRAM_SIZE:
+                    self._udp_sock.sendto(datagram, self._udp_addr)
+                    datagram = b""
+                datagram = datagram + b"\n" + data if datagram else data
+            if datagram:
+                self._udp_sock.sendto(datagram, self._udp_addr)
             return True
 
-        except InfluxDBError as e:
-            logger.error(f"InfluxDB error writing batch: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Unexpected error writing batch: {e}")
+        except OSError as e:
+            logger.warning("Failed to send metrics over UDP: %s", e)
             return False
 
     def query_data(self, query: str) -> Optional[List[Dict[str, Any]]]:
         """Execute a Flux query and return results."""
-        if not self.is_connected():
+        if not self.connected:
             logger.error("Not connected to InfluxDB")
             return None
 
@@ -207,10 +324,10 @@ class InfluxDBClient:
             return data
 
         except InfluxDBError as e:
-            logger.error(f"InfluxDB error executing query: {e}")
+            logger.error("InfluxDB error executing query: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Unexpected error executing query: {e}")
+            logger.error("Unexpected error executing query: %s", e)
             return None
 
     def get_latest_readings(
@@ -218,7 +335,7 @@ class InfluxDBClient:
     ) -> Optional[List[Dict[str, Any]]]:
         """Get the latest readings for a specific sensor."""
         query = f"""
-        from(bucket: "{self.settings.bucket}")
+        from(bucket: "{self._bucket}")
           |> range(start: -1h)
           |> filter(fn: (r) => r["_measurement"] == "sensors")
           |> filter(fn: (r) => r["sensor_id"] == "{sensor_id}")
@@ -239,8 +356,10 @@ class InfluxDBClient:
                 return True
 
             logger.info(
-                f"Attempt {attempt + 1}/{max_retries} failed, retrying in "
-                f"{retry_interval} seconds..."
+                "Attempt %d/%d failed, retrying in %s seconds...",
+                attempt + 1,
+                max_retries,
+                retry_interval,
             )
             time.sleep(retry_interval)
 
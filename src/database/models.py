@@ -4,12 +4,86 @@ Data models for the PumpTech system.
 Defines the structure of data points that will be stored in InfluxDB.
 """
 
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, Optional
-
-
-@dataclass
+import math
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Line protocol escaping, matching influxdb_client's Point serializer
+_ESCAPE_KEY = str.maketrans(
+    {",": r"\,", "=": r"\=", " ": r"\ ", "\n": r"\n", "\t": r"\t", "\r": r"\r"}
+)
+_ESCAPE_MEASUREMENT = str.maketrans(
+    {",": r"\,", " ": r"\ ", "\n": r"\n", "\t": r"\t", "\r": r"\r"}
+)
+_ESCAPE_STRING = str.maketrans({'"': r"\"", "\\": r"\\"})
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+
+
+def _to_nanoseconds(timestamp: datetime) -> int:
+    """Convert a timestamp to epoch nanoseconds; naive values are UTC."""
+    delta = timestamp - (_EPOCH if timestamp.tzinfo is None else _EPOCH_UTC)
+    return (
+        delta.days * 86_400_000_000_000
+        + delta.seconds * 1_000_000_000
+        + delta.microseconds * 1_000
+    )
+
+
+def _format_field(value: Any) -> Optional[str]:
+    """Format a field value for line protocol, or None to skip it."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return f"{value}i"
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return None
+        text = str(value)
+        return text[:-2] if text.endswith(".0") else text
+    if isinstance(value, str):
+        return f'"{value.translate(_ESCAPE_STRING)}"'
+    raise ValueError(f'Type: "{type(value)}" of field value is not supported.')
+
+
+@lru_cache(maxsize=1024)
+def _tag_prefix(measurement: str, *tags: Tuple[str, Any]) -> str:
+    """Build the measurement and tag set part of a line protocol record."""
+    prefix = measurement.translate(_ESCAPE_MEASUREMENT)
+    for key, value in tags:
+        if value is None:
+            continue
+        value = str(value).translate(_ESCAPE_KEY)
+        if value.endswith("\\"):
+            value += " "
+        if value:
+            prefix += f",{key}={value}"
+    return prefix
+
+
+def _line(prefix: str, fields: Iterable[Tuple[str, Any]], timestamp: Any) -> str:
+    """Join a cached prefix with the field set and timestamp of a record."""
+    field_set = []
+    for key, value in fields:
+        text = _format_field(value)
+        if text is not None:
+            field_set.append(f"{str(key).translate(_ESCAPE_KEY)}={text}")
+    if not field_set:
+        return ""
+
+    line = f"{prefix} {','.join(field_set)}"
+    if timestamp is not None:
+        line += f" {_to_nanoseconds(timestamp)}"
+    return line
+
+
+@dataclass(slots=True, frozen=True)
 class SensorReading:
     """Represents a sensor reading data point."""
 
@@ -30,13 +104,31 @@ class SensorReading:
     timestamp: Optional[datetime] = None
 
     # Additional metadata
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    # Measurement and tags in line protocol form, built once per reading
+    _tag_str: str = field(default="", init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
+        # Frozen, so derived attributes are set through object.__setattr__
         if self.timestamp is None:
-            self.timestamp = datetime.utcnow()
-        if self.metadata is None:
-            self.metadata = {}
+            object.__setattr__(self, "timestamp", datetime.utcnow())
+        # Readings from one sensor repeat the same tag values every cycle;
+        # non-string tags such as None are left for _tag_prefix to skip
+        for name in ("location", "sensor_id", "sensor_type"):
+            value = getattr(self, name)
+            if isinstance(value, str):
+                object.__setattr__(self, name, sys.intern(value))
+        object.__setattr__(
+            self,
+            "_tag_str",
+            _tag_prefix(
+                self.measurement,
+                ("location", self.location),
+                ("sensor_id", self.sensor_id),
+                ("sensor_type", self.sensor_type),
+            ),
+        )
 
     def to_influx_point(self) -> Dict[str, Any]:
         """Convert to InfluxDB point format."""
@@ -61,8 +153,23 @@ class SensorReading:
 
         return point
 
+    def _field_items(self) -> List[Tuple[str, Any]]:
+        """Field keys and values for line protocol."""
+        items = [
+            ("quality", self.quality),
+            ("unit", self.unit),
+            ("value", self.value),
+        ]
+        if self.metadata:
+            items.extend(self.metadata.items())
+        return items
+
+    def to_line_protocol(self) -> str:
+        """Convert to an InfluxDB line protocol record."""
+        return _line(self._tag_str, self._field_items(), self.timestamp)
+
 
-@dataclass
+@dataclass(slots=True)
 class SystemMetric:
     """Represents a system metric data point."""
 
@@ -82,13 +189,17 @@ class SystemMetric:
     timestamp: Optional[datetime] = None
 
     # Additional fields
-    additional_fields: Optional[Dict[str, Any]] = None
+    additional_fields: Dict[str, Any] = field(default_factory=dict)
+
+    # Measurement and tags in line protocol form, built once per metric
+    _tag_str: str = field(default="", init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.timestamp is None:
             self.timestamp = datetime.utcnow()
-        if self.additional_fields is None:
-            self.additional_fields = {}
+        self._tag_str = _tag_prefix(
+            self.measurement, ("component", self.component), ("host", self.host)
+        )
 
     def to_influx_point(self) -> Dict[str, Any]:
         """Convert to InfluxDB point format."""
@@ -112,8 +223,19 @@ class SystemMetric:
 
         return point
 
+    def to_line_protocol(self) -> str:
+        """Convert to an InfluxDB line protocol record."""
+        fields = [
+            ("metric_name", self.metric_name),
+            ("metric_unit", self.metric_unit),
+            ("metric_value", self.metric_value),
+        ]
+        if self.additional_fields:
+            fields.extend(self.additional_fields.items())
+        return _line(self._tag_str, fields, self.timestamp)
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PumpReading(SensorReading):
     """Specialized sensor reading for pump data."""
 
@@ -130,7 +252,7 @@ class PumpReading(SensorReading):
 
     def to_influx_point(self) -> Dict[str, Any]:
         """Convert to InfluxDB point format with pump-specific fields."""
-        point = super().to_influx_point()
+        point = SensorReading.to_influx_point(self)
 
         # Add pump-specific fields
         pump_fields = {
@@ -145,8 +267,21 @@ class PumpReading(SensorReading):
         point["fields"].update(pump_fields)
         return point
 
-
-@dataclass
+    def _field_items(self) -> List[Tuple[str, Any]]:
+        """Field keys and values for line protocol, including pump fields."""
+        items = SensorReading._field_items(self)
+        items += [
+            ("flow_rate", self.flow_rate),
+            ("power_consumption", self.power_consumption),
+            ("pressure", self.pressure),
+            ("rpm", self.rpm),
+            ("temperature", self.temperature),
+            ("vibration", self.vibration),
+        ]
+        return items
+
+
+@dataclass(slots=True, frozen=True)
 class AlarmEvent:
     """Represents an alarm or event data point."""
 
@@ -167,13 +302,24 @@ class AlarmEvent:
     timestamp: Optional[datetime] = None
 
     # Additional context
-    context: Optional[Dict[str, Any]] = None
+    context: Dict[str, Any] = field(default_factory=dict)
+
+    # Measurement and tags in line protocol form, built once per event
+    _tag_str: str = field(default="", init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if self.timestamp is None:
-            self.timestamp = datetime.utcnow()
-        if self.context is None:
-            self.context = {}
+            object.__setattr__(self, "timestamp", datetime.utcnow())
+        object.__setattr__(
+            self,
+            "_tag_str",
+            _tag_prefix(
+                self.measurement,
+                ("category", self.category),
+                ("severity", self.severity),
+                ("source", self.source),
+            ),
+        )
 
     def to_influx_point(self) -> Dict[str, Any]:
         """Convert to InfluxDB point format."""
@@ -197,3 +343,14 @@ class AlarmEvent:
             point["fields"].update(self.context)  # type: ignore[union-attr]
 
         return point
+
+    def to_line_protocol(self) -> str:
+        """Convert to an InfluxDB line protocol record."""
+        fields = [
+            ("acknowledged", self.acknowledged),
+            ("alarm_code", self.alarm_code),
+            ("message", self.message),
+        ]
+        if self.context:
+            fields.extend(self.context.items())
+        return _line(self._tag_str, fields, self.timestamp)
@@ -1,6 +1,6 @@
 """Hardware interface modules for the PumpTech system."""
 
-from .base import HardwareInterface
+from .base import HardwareError, HardwareInterface
 from .mock_hardware import MockHardware
 
-__all__ = ["HardwareInterface", "MockHardware"]
+__all__ = ["HardwareError", "HardwareInterface", "MockHardware"]
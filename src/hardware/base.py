@@ -5,16 +5,35 @@ Defines the abstract interface that all hardware implementations must follow.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
 
+from ..config.settings import HardwareSettings
 from ..database.models import AlarmEvent, PumpReading, SensorReading
 
 
+class HardwareError(Exception):
+    """Recoverable failure while talking to hardware."""
+
+
 class HardwareInterface(ABC):
-    """Abstract base class for hardware interfaces."""
+    """
+    Abstract base class for hardware interfaces.
+
+    Implementations whose bus supports multi-register reads may also define
+    read_all_pumps(pump_ids, timestamp) to read several pumps in one
+    transaction; callers fall back to get_pump_data() per pump otherwise.
+
+    Threading: get_pump_data() must be safe to call concurrently for different
+    pumps, since the collector issues per-pump reads from a thread pool. Every
+    other method is called from one thread at a time.
+    """
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Optional[HardwareSettings] = None):
         """Initialize the hardware interface with configuration."""
+        if config is None:
+            config = HardwareSettings()
+
         self.config = config
         self.connected = False
         self.last_error: Optional[str] = None
@@ -35,18 +54,24 @@ class HardwareInterface(ABC):
         pass
 
     @abstractmethod
-    def read_sensor(self, sensor_id: str) -> Optional[SensorReading]:
-        """Read a single sensor value."""
+    def read_sensor(
+        self, sensor_id: str, timestamp: Optional[datetime] = None
+    ) -> Optional[SensorReading]:
+        """Read a single sensor value, stamped with timestamp if given."""
         pass
 
     @abstractmethod
-    def read_all_sensors(self) -> List[SensorReading]:
-        """Read all available sensors."""
+    def read_all_sensors(
+        self, timestamp: Optional[datetime] = None
+    ) -> List[SensorReading]:
+        """Read all available sensors, stamping each reading with timestamp."""
         pass
 
     @abstractmethod
-    def get_pump_data(self, pump_id: str) -> Optional[PumpReading]:
-        """Get comprehensive pump data."""
+    def get_pump_data(
+        self, pump_id: str, timestamp: Optional[datetime] = None
+    ) -> Optional[PumpReading]:
+        """Get comprehensive pump data, stamped with timestamp if given."""
         pass
 
     @abstractmethod
@@ -60,8 +85,8 @@ class HardwareInterface(ABC):
         pass
 
     @abstractmethod
-    def get_alarms(self) -> List[AlarmEvent]:
-        """Get current alarms/alerts."""
+    def get_alarms(self) -> Sequence[AlarmEvent]:
+        """Get current alarms/alerts. Callers must not mutate the result."""
         pass
 
     @abstractmethod
@@ -91,6 +116,10 @@ class HardwareInterface(ABC):
 class SensorInterface(ABC):
     """Abstract base class for individual sensor interfaces."""
 
+    # Sensors are polled every cycle, so use slots for cheaper attribute access;
+    # subclasses that declare no slots of their own still get a __dict__
+    __slots__ = ("sensor_id", "sensor_type", "location", "last_reading", "last_error")
+
     def __init__(self, sensor_id: str, sensor_type: str, location: str = "unknown"):
         """Initialize the sensor interface."""
         self.sensor_id = sensor_id
@@ -100,7 +129,7 @@ class SensorInterface(ABC):
         self.last_error: Optional[str] = None
 
     @abstractmethod
-    def read(self) -> Optional[SensorReading]:
+    def read(self, timestamp: Optional[datetime] = None) -> Optional[SensorReading]:
         """Read the sensor value and return a SensorReading object."""
         pass
 
@@ -130,6 +159,8 @@ class SensorInterface(ABC):
 class PumpInterface(ABC):
     """Abstract base class for pump interfaces."""
 
+    __slots__ = ("pump_id", "location", "is_running", "current_speed", "last_error")
+
     def __init__(self, pump_id: str, location: str = "unknown"):
         """Initialize the pump interface."""
         self.pump_id = pump_id
@@ -159,7 +190,9 @@ class PumpInterface(ABC):
         pass
 
     @abstractmethod
-    def get_readings(self) -> Optional[PumpReading]:
+    def get_readings(
+        self, timestamp: Optional[datetime] = None
+    ) -> Optional[PumpReading]:
         """Get comprehensive pump readings."""
         pass
 
@@ -7,16 +7,73 @@ Simulates hardware sensors and pumps with realistic data patterns.
 import math
 import random
 import time
+from dataclasses import replace
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
+from ..config.settings import HardwareSettings
 from ..database.models import AlarmEvent, PumpReading, SensorReading
 from .base import HardwareInterface, PumpInterface, SensorInterface
 
+# Dedicated generator so simulated data does not share state with the global
+# random module, and so its bound methods can be looked up once
+_rng = random.Random()
+
+# Error set by every call made while disconnected
+_NOT_CONNECTED = "Hardware not connected"
+
+
+def _pump_kernel(
+    speed_factor: float, r: Sequence[float]
+) -> Tuple[int, int, float, int, float, float]:
+    """
+    Compute simulated pump values from the speed factor (0-1).
+
+    r holds six uniform [0, 1) samples, one per value, so the kernel itself is
+    plain arithmetic with no calls back into the random module.
+    """
+    # Flow rate (L/min) - proportional to speed with some variation
+    flow_rate = 100.0 * speed_factor + (r[0] - 0.5) * 4.0
+    flow_rate = max(0, int(round(flow_rate)))
+
+    # Pressure (bar) - increases with speed
+    pressure = 5.0 * speed_factor + (r[1] - 0.5) * 0.4
+    pressure = max(0, int(round(pressure)))
+
+    # Temperature (°C) - ambient plus up to 15°C rise at full speed
+    temperature = 25.0 + speed_factor * 15.0 + (r[2] - 0.5) * 2.0
+
+    # Power consumption (W) - quadratic relationship with speed
+    power = 1000.0 * speed_factor * speed_factor + (r[3] - 0.5) * 40.0
+    power = max(0, int(round(power)))
+
+    # RPM - proportional to speed
+    rpm = 3000.0 * speed_factor + (r[4] - 0.5) * 100.0
+    rpm = max(0.0, float(round(rpm, 0)))
+
+    # Vibration - increases with speed and wear
+    vibration = max(0, 0.1 + speed_factor * 0.5 + (r[5] - 0.5) * 0.1)
+
+    return flow_rate, pressure, temperature, power, rpm, vibration
+
 
 class MockSensor(SensorInterface):
     """Mock sensor implementation with realistic data patterns."""
 
+    __slots__ = (
+        "base_value",
+        "variation",
+        "unit",
+        "start_ns",
+        "healthy",
+        "_sine_amp",
+        "_noise_amp",
+        "_min_val",
+        "_max_val",
+        "_metadata",
+        "_health_listener",
+    )
+
     def __init__(
         self,
         sensor_id: str,
@@ -31,37 +88,62 @@ class MockSensor(SensorInterface):
         self.base_value = base_value
         self.variation = variation
         self.unit = unit
-        self.start_time = time.time()
+        self.start_ns = time.monotonic_ns()
         self.healthy = True
 
-    def read(self) -> Optional[SensorReading]:
-        """Generate a realistic sensor reading."""
+        # Amplitudes and clip bounds only depend on the constructor arguments
+        self._sine_amp = variation * 0.3
+        self._noise_amp = variation * 0.2
+        self._min_val = base_value - variation * 2
+        self._max_val = base_value + variation * 2
+
+        # Same for every reading, so one dict is shared by reference; readings
+        # only ever read their metadata
+        self._metadata = {
+            "mock": True,
+            "base_value": base_value,
+            "variation": variation,
+        }
+
+        # Called with the sensor when its health changes; set by MockHardware
+        self._health_listener: Optional[Callable[["MockSensor"], None]] = None
+
+    def read(
+        self, timestamp: Optional[datetime] = None, now_ns: Optional[int] = None
+    ) -> Optional[SensorReading]:
+        """
+        Generate a realistic sensor reading.
+
+        now_ns is the time.monotonic_ns() value driving the simulated pattern;
+        sweeps over many sensors pass one value instead of reading the clock
+        per sensor.
+        """
         if not self.healthy:
             self._set_error("Sensor is not healthy")
             return None
 
         try:
             # Generate realistic data with some patterns
-            elapsed = time.time() - self.start_time
+            if now_ns is None:
+                now_ns = time.monotonic_ns()
+            # Integer nanoseconds keep precision and ignore wall-clock jumps
+            elapsed = (now_ns - self.start_ns) * 1e-9
 
             # Add some sine wave pattern for realistic variation
-            sine_component = math.sin(elapsed / 60) * (self.variation * 0.3)
+            sine_component = math.sin(elapsed / 60) * self._sine_amp
 
             # Add random noise
-            noise = random.uniform(-self.variation * 0.2, self.variation * 0.2)
+            rand = _rng.random
+            noise = (rand() * 2 - 1) * self._noise_amp
 
-            # Occasional spikes or dips
-            if random.random() < 0.05:  # 5% chance
-                spike = random.uniform(-self.variation, self.variation)
-            else:
-                spike = 0
+            # Occasional spikes or dips (5% chance); the comparison acts as a
+            # 0/1 mask so there is no data-dependent branch
+            spike = (rand() < 0.05) * (rand() * 2 - 1) * self.variation
 
             value = self.base_value + sine_component + noise + spike
 
             # Ensure value stays within reasonable bounds
-            min_val = self.base_value - self.variation * 2
-            max_val = self.base_value + self.variation * 2
-            value = max(min_val, min(max_val, value))
+            value = max(self._min_val, min(self._max_val, value))
 
             reading = SensorReading(
                 location=self.location,
@@ -70,12 +152,8 @@ class MockSensor(SensorInterface):
                 value=round(value, 2),
                 unit=self.unit,
                 quality="good",
-                timestamp=datetime.utcnow(),
-                metadata={
-                    "mock": True,
-                    "base_value": self.base_value,
-                    "variation": self.variation,
-                },
+                timestamp=timestamp,
+                metadata=self._metadata,
             )
 
             self.last_reading = reading
@@ -96,35 +174,68 @@ class MockSensor(SensorInterface):
     def set_health(self, healthy: bool) -> None:
         """Set sensor health status for testing."""
         self.healthy = healthy
+        if not healthy:
+            # Sweeps skip unhealthy sensors, so record the error up front
+            self._set_error("Sensor is not healthy")
+        if self._health_listener is not None:
+            self._health_listener(self)
 
 
 class MockPump(PumpInterface):
     """Mock pump implementation with realistic behavior."""
 
+    __slots__ = (
+        "target_speed",
+        "actual_speed",
+        "start_ns",
+        "total_runtime",
+        "healthy",
+        "_cached_status",
+        "_status_dirty",
+        "_run_listener",
+    )
+
     def __init__(self, pump_id: str, location: str = "unknown"):
         """Initialize mock pump."""
         super().__init__(pump_id, location)
         self.target_speed = 0.0
         self.actual_speed = 0.0
-        self.start_time = time.time()
+        self.start_ns = time.monotonic_ns()
         self.total_runtime = 0.0
         self.healthy = True
 
+        # Status of a settled pump does not change until it is commanded again
+        self._cached_status: Dict[str, Any] = {}
+        self._status_dirty = True
+
+        # Called with the pump when it starts or stops; set by MockHardware
+        self._run_listener: Optional[Callable[["MockPump"], None]] = None
+
+    def _set_running(self, running: bool) -> None:
+        """Set the running state, notifying the listener if it changed."""
+        changed = running != self.is_running
+        self.is_running = running
+        self._status_dirty = True
+        if changed and self._run_listener is not None:
+            self._run_listener(self)
+
     def start(self) -> bool:
         """Start the pump."""
         if not self.healthy:
             self._set_error("Pump is not healthy")
             return False
 
-        self.is_running = True
+        self._set_running(True)
         if self.target_speed == 0:
             self.target_speed = 50.0  # Default to 50% speed
+        self._status_dirty = True
         return True
 
     def stop(self) -> bool:
         """Stop the pump."""
-        self.is_running = False
+        self._set_running(False)
         self.target_speed = 0.0
+        self._status_dirty = True
         return True
 
     def set_speed(self, speed_percent: float) -> bool:
@@ -135,14 +246,21 @@ class MockPump(PumpInterface):
 
         self.target_speed = speed_percent
         if speed_percent > 0:
-            self.is_running = True
+            self._set_running(True)
         else:
-            self.is_running = False
+            self._set_running(False)
 
+        self._status_dirty = True
         return True
 
     def get_status(self) -> Dict[str, Any]:
-        """Get pump status."""
+        """Get pump status. The returned dict is shared and must not be mutated."""
+        # Nothing to simulate once the pump has reached its target speed
+        if not self._status_dirty and (
+            not self.is_running or self.actual_speed == self.target_speed
+        ):
+            return self._cached_status
+
         # Simulate gradual speed changes
         if self.is_running:
             speed_diff = self.target_speed - self.actual_speed
@@ -151,7 +269,7 @@ class MockPump(PumpInterface):
             else:
                 self.actual_speed = self.target_speed
 
-        return {
+        self._cached_status = {
             "pump_id": self.pump_id,
             "is_running": self.is_running,
             "target_speed": self.target_speed,
@@ -159,47 +277,26 @@ class MockPump(PumpInterface):
             "healthy": self.healthy,
             "total_runtime": self.total_runtime,
         }
+        self._status_dirty = False
+        return self._cached_status
 
-    def get_readings(self) -> Optional[PumpReading]:
+    def get_readings(
+        self, timestamp: Optional[datetime] = None
+    ) -> Optional[PumpReading]:
         """Get comprehensive pump readings."""
         if not self.healthy:
             return None
 
         # status = self.get_status()  # TODO: Use this for more realistic simulation
-        # elapsed = time.time() - self.start_time  # TODO: Use for wear simulation
+        # TODO: Use for wear simulation
+        # elapsed = (time.monotonic_ns() - self.start_ns) * 1e-9
 
         # Generate realistic pump data based on speed
-        speed_factor = self.actual_speed / 100.0
-
-        # Flow rate (L/min) - proportional to speed with some variation
-        base_flow = 100.0  # Max flow at 100% speed
-        flow_rate = base_flow * speed_factor + random.uniform(-2, 2)
-        flow_rate = max(0, int(round(flow_rate)))  # Convert to integer
-
-        # Pressure (bar) - increases with speed
-        base_pressure = 5.0
-        pressure = base_pressure * speed_factor + random.uniform(-0.2, 0.2)
-        pressure = max(0, int(round(pressure)))  # Convert to integer
-
-        # Temperature (°C) - increases with load
-        ambient_temp = 25.0
-        temp_rise = speed_factor * 15.0  # Up to 15°C rise at full speed
-        temperature = ambient_temp + temp_rise + random.uniform(-1, 1)
-
-        # Power consumption (W) - quadratic relationship with speed
-        base_power = 1000.0  # Max power at 100% speed
-        power = base_power * (speed_factor**2) + random.uniform(-20, 20)
-        power = max(0, int(round(power)))  # Convert to integer
-
-        # RPM - proportional to speed
-        max_rpm = 3000.0
-        rpm = max_rpm * speed_factor + random.uniform(-50, 50)
-        rpm = max(0.0, float(round(rpm, 0)))  # Ensure it's always a float with .0
-
-        # Vibration - increases with speed and wear
-        base_vibration = 0.1
-        vibration = base_vibration + speed_factor * 0.5 + random.uniform(-0.05, 0.05)
-        vibration = max(0, vibration)
+        rand = _rng.random
+        flow_rate, pressure, temperature, power, rpm, vibration = _pump_kernel(
+            self.actual_speed / 100.0,
+            (rand(), rand(), rand(), rand(), rand(), rand()),
+        )
 
         return PumpReading(
             location=self.location,
@@ -208,7 +305,7 @@ class MockPump(PumpInterface):
             value=flow_rate,  # Already an integer
             unit="L/min",
             quality="good",
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp,
             flow_rate=flow_rate,  # Already an integer
             pressure=pressure,  # Already an integer
             temperature=round(temperature, 2),
@@ -225,25 +322,52 @@ class MockPump(PumpInterface):
 
     def emergency_stop(self) -> bool:
         """Emergency stop the pump."""
-        self.is_running = False
+        self._set_running(False)
         self.target_speed = 0.0
         self.actual_speed = 0.0
+        self._status_dirty = True
         return True
 
     def set_health(self, healthy: bool) -> None:
         """Set pump health status for testing."""
         self.healthy = healthy
+        self._status_dirty = True
 
 
 class MockHardware(HardwareInterface):
     """Mock hardware system with multiple sensors and pumps."""
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Optional[HardwareSettings] = None):
         """Initialize mock hardware system."""
         super().__init__(config)
         self.sensors: Dict[str, MockSensor] = {}
         self.pumps: Dict[str, MockPump] = {}
         self.alarms: List[AlarmEvent] = []
+
+        # Read-only snapshot of alarms handed to callers; rebuilt only when an
+        # alarm is added, so polling does not copy the list every cycle
+        self._alarms_view: Tuple[AlarmEvent, ...] = ()
+
+        # alarm_code -> position in self.alarms of the first alarm raised with
+        # that code, for acknowledge_alarm
+        self._alarm_index: Dict[str, int] = {}
+
+        # Snapshots of the device dicts for the per-cycle loops; the device
+        # set only changes through add_sensor() and add_pump()
+        self._sensor_tuple: Tuple[MockSensor, ...] = ()
+        self._pump_tuple: Tuple[MockPump, ...] = ()
+
+        # Position of each sensor in _sensor_tuple
+        self._sensor_index: Dict[str, int] = {}
+
+        # Sensors read by read_all_sensors; unhealthy ones are left out. Kept
+        # current by the sensors' health listener
+        self._healthy_sensors: Tuple[MockSensor, ...] = ()
+
+        # Counts for get_system_status, updated as pumps and alarms change
+        self._running_pumps: Set[str] = set()
+        self._unack_alarm_count = 0
+
         self._setup_default_hardware()
 
     def _setup_default_hardware(self) -> None:
@@ -278,6 +402,51 @@ class MockHardware(HardwareInterface):
         self.pumps["pump_001"] = MockPump("pump_001", "main_station")
         self.pumps["pump_002"] = MockPump("pump_002", "backup_station")
 
+        self._index_sensors()
+        self._index_pumps()
+
+    def _index_sensors(self) -> None:
+        """Rebuild the sensor tuple and index after a change."""
+        self._sensor_tuple = tuple(self.sensors.values())
+        self._sensor_index = {
+            sensor.sensor_id: i for i, sensor in enumerate(self._sensor_tuple)
+        }
+        for sensor in self._sensor_tuple:
+            sensor._health_listener = self._on_sensor_health
+        self._refresh_healthy()
+
+    def _refresh_healthy(self) -> None:
+        """Rebuild the tuple of healthy sensors."""
+        self._healthy_sensors = tuple(
+            sensor for sensor in self._sensor_tuple if sensor.healthy
+        )
+
+    def _on_sensor_health(self, sensor: MockSensor) -> None:
+        """Update the healthy sensors when a sensor's health changes."""
+        i = self._sensor_index.get(sensor.sensor_id)
+        # Ignore sensors that have since been replaced under the same ID
+        if i is not None and self._sensor_tuple[i] is sensor:
+            self._refresh_healthy()
+
+    def _index_pumps(self) -> None:
+        """Rebuild the pump tuple and running set after a change."""
+        self._pump_tuple = tuple(self.pumps.values())
+        self._running_pumps = {
+            pump.pump_id for pump in self._pump_tuple if pump.is_running
+        }
+        for pump in self._pump_tuple:
+            pump._run_listener = self._on_pump_run
+
+    def _on_pump_run(self, pump: MockPump) -> None:
+        """Track pumps starting and stopping."""
+        # Ignore pumps that have since been replaced under the same ID
+        if self.pumps.get(pump.pump_id) is not pump:
+            return
+        if pump.is_running:
+            self._running_pumps.add(pump.pump_id)
+        else:
+            self._running_pumps.discard(pump.pump_id)
+
     def connect(self) -> bool:
         """Connect to mock hardware."""
         self.connected = True
@@ -291,10 +460,12 @@ class MockHardware(HardwareInterface):
         """Check connection status."""
         return self.connected
 
-    def read_sensor(self, sensor_id: str) -> Optional[SensorReading]:
+    def read_sensor(
+        self, sensor_id: str, timestamp: Optional[datetime] = None
+    ) -> Optional[SensorReading]:
         """Read a specific sensor."""
         if not self.connected:
-            self._set_error("Hardware not connected")
+            self._set_error(_NOT_CONNECTED)
             return None
 
         sensor = self.sensors.get(sensor_id)
@@ -302,21 +473,30 @@ class MockHardware(HardwareInterface):
             self._set_error(f"Sensor {sensor_id} not found")
             return None
 
-        return sensor.read()
+        return sensor.read(timestamp)
 
-    def read_all_sensors(self) -> List[SensorReading]:
+    def read_all_sensors(
+        self, timestamp: Optional[datetime] = None
+    ) -> List[SensorReading]:
         """Read all sensors."""
-        readings = []
-        for sensor in self.sensors.values():
-            reading = sensor.read()
-            if reading:
-                readings.append(reading)
-        return readings
-
-    def get_pump_data(self, pump_id: str) -> Optional[PumpReading]:
+        # One timestamp and one clock read for the whole sweep
+        if timestamp is None:
+            timestamp = datetime.utcnow()
+        now_ns = time.monotonic_ns()
+
+        # A comprehension avoids the per-iteration append lookup and call
+        return [
+            reading
+            for sensor in self._healthy_sensors
+            if (reading := sensor.read(timestamp, now_ns)) is not None
+        ]
+
+    def get_pump_data(
+        self, pump_id: str, timestamp: Optional[datetime] = None
+    ) -> Optional[PumpReading]:
         """Get pump data."""
         if not self.connected:
-            self._set_error("Hardware not connected")
+            self._set_error(_NOT_CONNECTED)
             return None
 
         pump = self.pumps.get(pump_id)
@@ -324,12 +504,41 @@ class MockHardware(HardwareInterface):
             self._set_error(f"Pump {pump_id} not found")
             return None
 
-        return pump.get_readings()
+        return pump.get_readings(timestamp)
+
+    def read_all_pumps(
+        self, pump_ids: Sequence[str], timestamp: Optional[datetime] = None
+    ) -> List[PumpReading]:
+        """Read several pumps at once."""
+        if not self.connected:
+            self._set_error(_NOT_CONNECTED)
+            return []
+
+        if timestamp is None:
+            timestamp = datetime.utcnow()
+
+        readings: List[PumpReading] = []
+        append = readings.append
+        missing = None
+        for pump_id in pump_ids:
+            pump = self.pumps.get(pump_id)
+            if not pump:
+                missing = pump_id
+                continue
+
+            reading = pump.get_readings(timestamp)
+            if reading is not None:
+                append(reading)
+
+        # A misconfigured pump ID fails every cycle; format the error once
+        if missing is not None:
+            self._set_error(f"Pump {missing} not found")
+        return readings
 
     def control_pump(self, pump_id: str, action: str, **kwargs: Any) -> bool:
         """Control pump operations."""
         if not self.connected:
-            self._set_error("Hardware not connected")
+            self._set_error(_NOT_CONNECTED)
             return False
 
         pump = self.pumps.get(pump_id)
@@ -352,11 +561,11 @@ class MockHardware(HardwareInterface):
 
     def get_system_status(self) -> Dict[str, Any]:
         """Get overall system status."""
-        sensor_count = len(self.sensors)
-        healthy_sensors = sum(1 for s in self.sensors.values() if s.is_healthy())
+        sensor_count = len(self._sensor_tuple)
+        healthy_sensors = len(self._healthy_sensors)
 
-        pump_count = len(self.pumps)
-        running_pumps = sum(1 for p in self.pumps.values() if p.is_running)
+        pump_count = len(self._pump_tuple)
+        running_pumps = len(self._running_pumps)
 
         return {
             "connected": self.connected,
@@ -372,47 +581,59 @@ class MockHardware(HardwareInterface):
             },
             "alarms": {
                 "total": len(self.alarms),
-                "unacknowledged": sum(1 for a in self.alarms if not a.acknowledged),
+                "unacknowledged": self._unack_alarm_count,
             },
             "mock_hardware": True,
         }
 
-    def get_alarms(self) -> List[AlarmEvent]:
+    def get_alarms(self) -> Sequence[AlarmEvent]:
         """Get current alarms."""
         # Occasionally generate random alarms for testing
-        if random.random() < 0.01:  # 1% chance per call
+        if _rng.random() < 0.01:  # 1% chance per call
             alarm = AlarmEvent(
                 source="mock_system",
-                severity=random.choice(["info", "warning", "error"]),
+                severity=_rng.choice(["info", "warning", "error"]),
                 category="system",
                 message=f"Mock alarm generated at {datetime.utcnow()}",
-                alarm_code=f"MOCK_{random.randint(1000, 9999)}",
+                alarm_code=f"MOCK_{_rng.randint(1000, 9999)}",
                 acknowledged=False,
             )
+            self._alarm_index.setdefault(alarm.alarm_code, len(self.alarms))
             self.alarms.append(alarm)
+            self._alarms_view = tuple(self.alarms)
+            self._unack_alarm_count += 1
 
-        return self.alarms.copy()
+        return self._alarms_view
 
     def acknowledge_alarm(self, alarm_id: str) -> bool:
         """Acknowledge an alarm."""
-        for alarm in self.alarms:
-            if alarm.alarm_code == alarm_id:
-                alarm.acknowledged = True
-                return True
-        return False
+        i = self._alarm_index.get(alarm_id)
+        if i is None:
+            return False
+
+        # Alarms are frozen, so swap in an acknowledged copy
+        alarm = self.alarms[i]
+        if not alarm.acknowledged:
+            self.alarms[i] = replace(alarm, acknowledged=True)
+            self._alarms_view = tuple(self.alarms)
+            self._unack_alarm_count -= 1
+        return True
 
     def add_sensor(self, sensor: MockSensor) -> None:
         """Add a sensor to the mock hardware."""
         self.sensors[sensor.sensor_id] = sensor
+        self._index_sensors()
 
     def add_pump(self, pump: MockPump) -> None:
         """Add a pump to the mock hardware."""
         self.pumps[pump.pump_id] = pump
+        self._index_pumps()
 
     def simulate_sensor_failure(self, sensor_id: str) -> None:
         """Simulate a sensor failure for testing."""
-        if sensor_id in self.sensors:
-            self.sensors[sensor_id].set_health(False)
+        i = self._sensor_index.get(sensor_id)
+        if i is not None:
+            self._sensor_tuple[i].set_health(False)
 
     def simulate_pump_failure(self, pump_id: str) -> None:
         """Simulate a pump failure for testing."""
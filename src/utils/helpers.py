@@ -2,8 +2,12 @@
 Utility helper functions for the PumpTech system.
 """
 
+import math
+import time
+from collections import deque
 from datetime import datetime
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, Optional, Tuple
 
 from ..database.models import SensorReading
 
@@ -11,26 +15,32 @@ from ..database.models import SensorReading
 def format_timestamp(timestamp: Optional[datetime] = None) -> str:
     """Format a timestamp for display."""
     if timestamp is None:
-        timestamp = datetime.utcnow()
+        return _format_timestamp(datetime.utcnow())
 
+    # Readings from one collection cycle share a timestamp, so cache those
+    return _format_cached_timestamp(timestamp)
+
+
+def _format_timestamp(timestamp: datetime) -> str:
+    """Format a timestamp with strftime."""
     return timestamp.strftime("%Y-%m-%d %H:%M:%S UTC")
 
 
-def validate_sensor_reading(reading: SensorReading) -> bool:
-    """Validate a sensor reading for basic correctness."""
-    if not reading.sensor_id:
-        return False
+_format_cached_timestamp = lru_cache(maxsize=256)(_format_timestamp)
 
-    if not reading.sensor_type:
-        return False
 
-    if reading.value is None:
-        return False
+# Quality values accepted by validate_sensor_reading
+_QUALITY = frozenset({"good", "bad", "uncertain"})
 
-    if reading.quality not in ["good", "bad", "uncertain"]:
-        return False
 
-    return True
+def validate_sensor_reading(reading: SensorReading) -> bool:
+    """Validate a sensor reading for basic correctness."""
+    return bool(
+        reading.sensor_id
+        and reading.sensor_type
+        and reading.value is not None
+        and reading.quality in _QUALITY
+    )
 
 
 def safe_float_conversion(value: Any, default: float = 0.0) -> float:
@@ -51,12 +61,78 @@ def calculate_moving_average(values: list, window_size: int = 5) -> float:
     return float(sum(recent_values) / len(recent_values))
 
 
+class MovingAverage:
+    """
+    Streaming moving average over the last window_size values.
+
+    Keeps a running sum, so add() is O(1) instead of re-summing the window
+    the way calculate_moving_average() does for every new value. The sum is
+    compensated (Neumaier) so evicting a large value does not wipe out the
+    small ones, and it is recomputed exactly once per window to stop drift.
+    """
+
+    __slots__ = ("window_size", "_values", "_total", "_compensation", "_adds")
+
+    def __init__(self, window_size: int = 5):
+        if window_size <= 0:
+            raise ValueError("window_size must be positive")
+
+        self.window_size = window_size
+        self._values: deque = deque(maxlen=window_size)
+        self._total = 0.0
+        self._compensation = 0.0
+        self._adds = 0
+
+    def _accumulate(self, value: float) -> None:
+        """Add value to the running sum, keeping the rounding error."""
+        total = self._total + value
+        if abs(self._total) >= abs(value):
+            self._compensation += (self._total - total) + value
+        else:
+            self._compensation += (value - total) + self._total
+        self._total = total
+
+    def add(self, value: float) -> float:
+        """Add a value and return the updated average."""
+        values = self._values
+        if len(values) == self.window_size:
+            self._accumulate(-values[0])
+        values.append(value)
+        self._accumulate(value)
+
+        self._adds += 1
+        if self._adds >= self.window_size:
+            # Exact resync: the sum as a float plus its exact remainder
+            self._adds = 0
+            self._total = math.fsum(values)
+            self._compensation = math.fsum([*values, -self._total])
+
+        return (self._total + self._compensation) / len(values)
+
+    @property
+    def value(self) -> float:
+        """Current average, or 0.0 before any value is added."""
+        if not self._values:
+            return 0.0
+        return (self._total + self._compensation) / len(self._values)
+
+
 def is_value_in_range(value: float, min_val: float, max_val: float) -> bool:
     """Check if a value is within the specified range."""
     return min_val <= value <= max_val
 
 
+# Last (second, formatted UTC time) used by generate_alarm_code
+_alarm_code_time: Tuple[int, str] = (-1, "")
+
+
 def generate_alarm_code(source: str, severity: str) -> str:
     """Generate a unique alarm code."""
-    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    global _alarm_code_time
+    # Alarms tend to come in bursts, so reuse the formatted second
+    second = int(time.time())
+    cached_second, timestamp = _alarm_code_time
+    if second != cached_second:
+        timestamp = time.strftime("%Y%m%d%H%M%S", time.gmtime(second))
+        _alarm_code_time = (second, timestamp)
     return f"{source.upper()}_{severity.upper()}_{timestamp}"
@@ -0,0 +1,130 @@
+"""Shared fixtures for the test suite."""
+
+import threading
+from typing import Any, Callable, Iterator, List
+
+import pytest
+
+from src.data_collection import DataCollector
+from src.database import BatchBuffer
+from src.hardware import MockHardware
+
+
+class FakeDBClient:
+    """Database client stand-in that records written batches."""
+
+    connected = True
+    write_error_count = 0
+
+    def __init__(self) -> None:
+        self.batches: List[List[Any]] = []
+        self.written = threading.Event()
+        self.disconnected = False
+
+    def write_batch(self, data_points: List[Any]) -> bool:
+        self.batches.append(list(data_points))
+        self.written.set()
+        return True
+
+    def wait_for_connection(self) -> bool:
+        return True
+
+    def flush(self) -> bool:
+        return True
+
+    def disconnect(self) -> None:
+        self.connected = False
+        self.disconnected = True
+
+
+class FakeWriteApi:
+    """Write API stand-in that records whether it was closed."""
+
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeClient:
+    """influxdb_client.InfluxDBClient stand-in."""
+
+    def __init__(self) -> None:
+        self.write_apis: List[FakeWriteApi] = []
+
+    def ready(self) -> bool:
+        return True
+
+    def write_api(self, **kwargs: Any) -> FakeWriteApi:
+        api = FakeWriteApi()
+        self.write_apis.append(api)
+        return api
+
+    def query_api(self) -> None:
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class FailingWriteApi(FakeWriteApi):
+    """Write API whose queued batch is rejected when it is drained."""
+
+    def __init__(self, error_callback: Any) -> None:
+        super().__init__()
+        self.error_callback = error_callback
+        self.records: List[Any] = []
+
+    def write(self, **kwargs: Any) -> None:
+        self.records.append(kwargs["record"])
+
+    def close(self) -> None:
+        super().close()
+        for record in self.records:
+            self.error_callback(("bucket", "org", "ns"), record, OSError("401"))
+
+
+class FailingClient(FakeClient):
+    """Client whose write APIs reject every batch."""
+
+    def write_api(self, **kwargs: Any) -> FakeWriteApi:
+        api = FailingWriteApi(kwargs["error_callback"])
+        self.write_apis.append(api)
+        return api
+
+
+@pytest.fixture
+def db_client() -> FakeDBClient:
+    return FakeDBClient()
+
+
+@pytest.fixture
+def hardware() -> MockHardware:
+    hardware = MockHardware()
+    hardware.connect()
+    return hardware
+
+
+@pytest.fixture
+def make_buffer(db_client: FakeDBClient) -> Callable[..., BatchBuffer]:
+    """Build a BatchBuffer that writes to the db_client fixture."""
+
+    def factory(max_points: int = 3, max_age_s: float = 60.0) -> BatchBuffer:
+        return BatchBuffer(
+            db_client,  # type: ignore[arg-type]
+            max_points=max_points,
+            max_age_s=max_age_s,
+        )
+
+    return factory
+
+
+@pytest.fixture
+def collector(
+    hardware: MockHardware, db_client: FakeDBClient
+) -> Iterator[DataCollector]:
+    """A DataCollector over mock hardware and the db_client fixture."""
+    collector = DataCollector(hardware, db_client)  # type: ignore[arg-type]
+    yield collector
+    collector.stop()
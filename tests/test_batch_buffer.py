@@ -0,0 +1,77 @@
+"""Tests for write batching."""
+
+from typing import Callable
+
+from conftest import FakeDBClient
+
+from src.data_collection import DataCollector
+from src.database import BatchBuffer
+from src.hardware import MockHardware
+
+MakeBuffer = Callable[..., BatchBuffer]
+
+
+def test_flushes_when_max_points_is_reached(
+    db_client: FakeDBClient, make_buffer: MakeBuffer
+) -> None:
+    """A full batch is written immediately, in one request."""
+    buffer = make_buffer(max_points=3)
+
+    buffer.add([1, 2])
+    assert db_client.batches == []
+    assert len(buffer) == 2
+
+    buffer.add([3, 4])
+    assert db_client.batches == [[1, 2, 3, 4]]
+    assert len(buffer) == 0
+
+
+def test_flushes_partial_batch_after_max_age(
+    db_client: FakeDBClient, make_buffer: MakeBuffer
+) -> None:
+    """A partial batch is written by the timer once it is max_age_s old."""
+    buffer = make_buffer(max_points=100, max_age_s=0.05)
+
+    buffer.add([1])
+    buffer.add([2])
+    assert db_client.written.wait(timeout=2.0)
+    assert db_client.batches == [[1, 2]]
+    assert len(buffer) == 0
+
+
+def test_size_flush_cancels_the_age_timer(
+    db_client: FakeDBClient, make_buffer: MakeBuffer
+) -> None:
+    """Points written by a size flush are not written again by the timer."""
+    buffer = make_buffer(max_points=2, max_age_s=0.05)
+
+    buffer.add([1])
+    buffer.add([2])
+    assert buffer._timer is None
+    assert db_client.batches == [[1, 2]]
+
+
+def test_flush_without_points_writes_nothing(
+    db_client: FakeDBClient, make_buffer: MakeBuffer
+) -> None:
+    """Flushing an empty buffer does not issue an empty write."""
+    buffer = make_buffer()
+
+    assert buffer.flush()
+    assert db_client.batches == []
+
+
+def test_collector_stop_flushes_buffered_points(
+    hardware: MockHardware, db_client: FakeDBClient, make_buffer: MakeBuffer
+) -> None:
+    """Stopping the collector writes points still waiting in the buffer."""
+    buffer = make_buffer(max_points=1000)
+    collector = DataCollector(hardware, db_client, buffer)  # type: ignore[arg-type]
+    collector.running = True
+
+    assert collector.store_data([1, 2, 3])
+    assert db_client.batches == []
+
+    collector.stop()
+    assert db_client.batches == [[1, 2, 3]]
+    assert db_client.disconnected
@@ -0,0 +1,97 @@
+"""Tests for the data collector."""
+
+from datetime import datetime
+from typing import Any, List
+
+from conftest import FailingClient, FakeClient, FakeDBClient
+
+from src.config import get_settings
+from src.data_collection import DataCollector
+from src.database import InfluxDBClient
+from src.hardware import MockHardware
+
+
+def test_cycle_points_do_not_share_a_series_and_timestamp(
+    collector: DataCollector,
+) -> None:
+    """Two points with the same series and time would overwrite each other."""
+    now = datetime.utcnow()
+    points: List[Any] = []
+    collector.collect_sensor_data(out=points, timestamp=now)
+    collector.collect_pump_data(out=points, timestamp=now)
+    collector.collect_system_metrics(out=points, timestamp=now)
+
+    keys = [
+        (line.split(" ", 1)[0], line.rsplit(" ", 1)[1])
+        for line in (point.to_line_protocol() for point in points)
+    ]
+    assert len(keys) == len(set(keys))
+
+
+def test_flush_reports_whether_the_cycle_was_written(
+    collector: DataCollector, db_client: FakeDBClient
+) -> None:
+    """flush() waits for the writer and reports failed stores."""
+    assert collector.start()
+
+    assert collector.collect_and_store_all()
+    assert collector.flush()
+    assert len(db_client.batches) == 1
+
+    db_client.connected = False
+    assert collector.collect_and_store_all()
+    assert not collector.flush()
+
+    # Failures are reported once
+    assert collector.flush()
+
+
+def test_flush_fails_when_the_database_rejects_the_write(
+    hardware: MockHardware,
+) -> None:
+    """A batch the server rejects makes flush() report the cycle as failed."""
+
+    def factory(settings: Any) -> Any:
+        return FailingClient()
+
+    db_client = InfluxDBClient(get_settings(), client_factory=factory)
+    collector = DataCollector(hardware, db_client)
+    assert collector.start()
+
+    assert collector.collect_and_store_all()
+    assert not collector.flush()
+    assert collector.error_count == 1
+    collector.stop()
+
+
+class PerPumpHardware(MockHardware):
+    """Mock hardware without bulk pump reads."""
+
+    read_all_pumps = None  # type: ignore[assignment]
+
+
+def test_pump_reads_survive_a_restart(db_client: FakeDBClient) -> None:
+    """Per-pump reads still work after the collector is stopped and started."""
+    collector = DataCollector(PerPumpHardware(), db_client)  # type: ignore[arg-type]
+
+    for _ in range(2):
+        assert collector.start()
+        assert len(collector.collect_pump_data()) == len(collector.pump_ids)
+        assert collector.error_count == 0
+        collector.stop()
+
+
+def test_stop_does_not_reopen_the_write_api(hardware: MockHardware) -> None:
+    """Shutdown drains the batching write API once instead of reopening it."""
+    fake = FakeClient()
+
+    def factory(settings: Any) -> Any:
+        return fake
+
+    db_client = InfluxDBClient(get_settings(), client_factory=factory)
+    collector = DataCollector(hardware, db_client)
+    assert collector.start()
+    collector.stop()
+
+    assert len(fake.write_apis) == 1
+    assert fake.write_apis[0].closed
@@ -0,0 +1,38 @@
+"""Tests for the utility helpers."""
+
+import random
+
+import pytest
+
+from src.utils.helpers import MovingAverage, calculate_moving_average
+
+
+@pytest.mark.parametrize("window_size", [1, 2, 5, 17])
+def test_moving_average_matches_calculate_moving_average(window_size: int) -> None:
+    """The streaming average agrees with re-summing the window."""
+    rng = random.Random(1234)
+    average = MovingAverage(window_size)
+    values = []
+    for _ in range(10_000):
+        value = rng.uniform(-1e6, 1e6) * rng.choice([1e-6, 1.0, 1e6])
+        values.append(value)
+        expected = calculate_moving_average(values, window_size)
+        assert average.add(value) == pytest.approx(expected, rel=1e-9, abs=1e-9)
+    assert average.value == pytest.approx(
+        calculate_moving_average(values, window_size), rel=1e-9, abs=1e-9
+    )
+
+
+def test_moving_average_survives_evicting_a_large_value() -> None:
+    """Evicting a huge value must not cancel the small ones kept."""
+    average = MovingAverage(2)
+    average.add(1e16)
+    average.add(1.0)
+    assert average.add(1.0) == 1.0
+
+
+def test_moving_average_empty_and_invalid_window() -> None:
+    """No values average to 0.0 and the window must be positive."""
+    assert MovingAverage(3).value == 0.0
+    with pytest.raises(ValueError):
+        MovingAverage(0)
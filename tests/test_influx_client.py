@@ -0,0 +1,48 @@
+"""Tests for the InfluxDB client wrapper."""
+
+from typing import Any
+
+from conftest import FailingClient, FakeClient
+
+from src.config import get_settings
+from src.database import InfluxDBClient
+from src.database.models import SystemMetric
+
+
+def test_repeated_connect_reuses_write_api() -> None:
+    """Connecting twice must not leave a second batching write API open."""
+    fake = FakeClient()
+
+    def factory(settings: Any) -> Any:
+        return fake
+
+    client = InfluxDBClient(get_settings(), client_factory=factory)
+
+    assert client.connect()
+    assert client.connect()
+    assert client.wait_for_connection(max_retries=1, retry_interval=0)
+    assert len(fake.write_apis) == 1
+
+    client.disconnect()
+    assert all(api.closed for api in fake.write_apis)
+
+
+def test_flush_reports_rejected_writes() -> None:
+    """A batch rejected by the server makes the next flush() fail, once."""
+    fake = FailingClient()
+
+    def factory(settings: Any) -> Any:
+        return fake
+
+    client = InfluxDBClient(get_settings(), client_factory=factory)
+    assert client.connect()
+
+    # Queuing succeeds; the rejection only arrives when the batch is sent
+    assert client.write_batch(
+        [SystemMetric(component="cpu", metric_name="usage", metric_value=1.0)]
+    )
+    assert not client.flush()
+    assert client.write_error_count == 1
+
+    assert client.flush()
+    client.disconnect()
@@ -0,0 +1,71 @@
+"""Tests for the logging formatter."""
+
+import calendar
+import logging
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core.logging_setup import _IsoFormatter
+
+
+def make_record(created: float) -> logging.LogRecord:
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "msg", None, None)
+    record.created = created
+    return record
+
+
+def test_times_match_localtime_across_hours() -> None:
+    """Formatted times match localtime(), including across DST changes."""
+    formatter = _IsoFormatter("%(asctime)s")
+    start = int(time.time())
+    for created in range(start, start + 48 * 3600, 1800):
+        expected = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(created))
+        assert formatter.format(make_record(created)) == expected
+
+
+def test_half_hour_dst_change_is_picked_up(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A DST change between UTC hour boundaries is reflected within a minute."""
+    monkeypatch.setenv("TZ", "Australia/Lord_Howe")
+    time.tzset()
+    try:
+        formatter = _IsoFormatter("%(asctime)s")
+        # Lord Howe Island moves from UTC+10:30 to UTC+11 at 15:30 UTC
+        start = calendar.timegm((2026, 10, 3, 15, 0, 0))
+        for created in range(start, start + 3600, 60):
+            expected = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(created))
+            assert formatter.format(make_record(created)) == expected
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_datefmt_is_honoured() -> None:
+    """A custom datefmt replaces the ISO default."""
+    formatter = _IsoFormatter("%(asctime)s", datefmt="%H:%M")
+    created = time.time()
+    expected = time.strftime("%H:%M", time.localtime(created))
+    assert formatter.format(make_record(created)) == expected
+
+
+def test_queued_records_are_written_on_exit() -> None:
+    """Records logged right before sys.exit() still reach the console."""
+    script = (
+        "import logging, sys\n"
+        "from src.core.logging_setup import setup_logging\n"
+        "setup_logging(log_file='')\n"
+        "for i in range(50):\n"
+        "    logging.getLogger('test').error('line %d', i)\n"
+        "sys.exit(1)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 1
+    assert result.stdout.count("line ") == 50
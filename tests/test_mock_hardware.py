@@ -0,0 +1,135 @@
+"""Tests for the mock hardware simulation."""
+
+import random
+from typing import Any, Sequence
+
+import pytest
+
+from src.hardware import MockHardware, mock_hardware
+from src.hardware.mock_hardware import MockPump, MockSensor
+
+
+def assert_counts_match_scan(hardware: MockHardware) -> None:
+    """The incrementally tracked counts agree with a full scan."""
+    status = hardware.get_system_status()
+    sensors = list(hardware.sensors.values())
+    pumps = list(hardware.pumps.values())
+
+    healthy = sum(1 for s in sensors if s.is_healthy())
+    assert status["sensors"] == {
+        "total": len(sensors),
+        "healthy": healthy,
+        "unhealthy": len(sensors) - healthy,
+    }
+
+    running = sum(1 for p in pumps if p.is_running)
+    assert status["pumps"] == {
+        "total": len(pumps),
+        "running": running,
+        "stopped": len(pumps) - running,
+    }
+
+    assert status["alarms"] == {
+        "total": len(hardware.alarms),
+        "unacknowledged": sum(1 for a in hardware.alarms if not a.acknowledged),
+    }
+
+    # Sweeps read exactly the healthy sensors
+    assert sorted(r.sensor_id for r in hardware.read_all_sensors()) == sorted(
+        s.sensor_id for s in sensors if s.is_healthy()
+    )
+
+
+class StubRng:
+    """Stand-in for the mock generator with a tiny alarm code space."""
+
+    def __init__(
+        self, seed: int, codes: Sequence[int] = (), always_alarm: bool = False
+    ):
+        self._rng = random.Random(seed)
+        self._codes = list(codes)
+        self._always_alarm = always_alarm
+
+    def random(self) -> float:
+        return 0.0 if self._always_alarm else self._rng.random()
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        return self._rng.choice(seq)
+
+    def randint(self, a: int, b: int) -> int:
+        # Fixed codes if given, otherwise one of ten so codes repeat
+        if self._codes:
+            return self._codes.pop(0)
+        return self._rng.randint(a, a + 9)
+
+
+def test_status_counts_follow_random_operations(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Counts stay in step with health, pump and alarm changes."""
+    rng = random.Random(42)
+    monkeypatch.setattr(mock_hardware, "_rng", StubRng(7))
+    hardware = MockHardware()
+    hardware.connect()
+    hardware.add_pump(MockPump("pump_003"))
+    hardware.add_sensor(MockSensor("extra_001", "temperature"))
+
+    for _ in range(3000):
+        pump_id = rng.choice(list(hardware.pumps))
+        action = rng.choice(["start", "stop", "set_speed", "emergency_stop"])
+        hardware.control_pump(pump_id, action, speed=rng.choice([0, 30, 100]))
+
+        sensor = rng.choice(list(hardware.sensors.values()))
+        if rng.random() < 0.1:
+            hardware.simulate_sensor_failure(sensor.sensor_id)
+        elif rng.random() < 0.1:
+            sensor.set_health(True)
+
+        if rng.random() < 0.05:
+            hardware.simulate_pump_failure(pump_id)
+
+        for _ in range(5):
+            alarms = hardware.get_alarms()
+        if alarms and rng.random() < 0.2:
+            hardware.acknowledge_alarm(rng.choice(alarms).alarm_code)
+
+        assert_counts_match_scan(hardware)
+
+
+def test_replaced_devices_do_not_update_counts() -> None:
+    """Devices replaced under the same ID no longer affect the counts."""
+    hardware = MockHardware()
+    hardware.connect()
+
+    old_sensor = hardware.sensors["temp_001"]
+    hardware.add_sensor(MockSensor("temp_001", "temperature"))
+    old_sensor.set_health(False)
+
+    old_pump = hardware.pumps["pump_001"]
+    hardware.add_pump(MockPump("pump_001"))
+    old_pump.start()
+
+    assert_counts_match_scan(hardware)
+
+
+def test_acknowledge_duplicate_alarm_codes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Acknowledging a repeated code acknowledges the first alarm only."""
+    monkeypatch.setattr(
+        mock_hardware, "_rng", StubRng(0, [1234, 1234, 5678], always_alarm=True)
+    )
+    hardware = MockHardware()
+    hardware.connect()
+    for _ in range(3):
+        hardware.get_alarms()
+
+    first, second, third = hardware.get_alarms()[:3]
+    assert first.alarm_code == second.alarm_code == "MOCK_1234"
+
+    assert hardware.acknowledge_alarm("MOCK_1234")
+    assert hardware.acknowledge_alarm("MOCK_1234")
+    assert not hardware.acknowledge_alarm("MOCK_0000")
+
+    alarms = hardware.get_alarms()
+    assert [a.acknowledged for a in alarms[:3]] == [True, False, False]
+    assert alarms[1] is second and alarms[2] is third
+    assert_counts_match_scan(hardware)
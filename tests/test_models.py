@@ -0,0 +1,193 @@
+"""Tests for the InfluxDB data models."""
+
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Tuple
+
+import pytest
+from influxdb_client import Point, WritePrecision
+
+from src.database.models import AlarmEvent, PumpReading, SensorReading, SystemMetric
+
+
+def split_record(line: str) -> Tuple[str, List[str], str]:
+    """Split a line protocol record into series, sorted fields and timestamp."""
+    # Sections are separated by unescaped spaces outside string field values
+    sections: List[List[str]] = [[""]]
+    escaped = quoted = False
+    for char in line:
+        in_fields = len(sections) == 2
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == '"' and in_fields:
+            quoted = not quoted
+        elif not quoted and char == " " and len(sections) < 3:
+            sections.append([""])
+            continue
+        elif not quoted and char == "," and in_fields:
+            sections[-1].append("")
+            continue
+        sections[-1][-1] += char
+    series, fields, timestamp = (sections + [[""], [""]])[:3]
+    return series[0], sorted(fields), timestamp[0]
+
+
+def point_record(data_point: Any) -> str:
+    """Serialize a model through influxdb_client's Point for comparison."""
+    point = Point.from_dict(
+        data_point.to_influx_point(),
+        write_precision=WritePrecision.NS,  # type: ignore[arg-type]
+    )
+    return str(point.to_line_protocol())
+
+
+def assert_same_record(data_point: Any) -> None:
+    """The hand-written serializer agrees with Point up to field order."""
+    assert split_record(data_point.to_line_protocol()) == split_record(
+        point_record(data_point)
+    )
+
+
+NAIVE = datetime(2024, 1, 2, 3, 4, 5, 678901)
+AWARE = datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone(timedelta(hours=5)))
+
+
+@pytest.mark.parametrize(
+    "tag",
+    ["plain", "with space", "a,b", "k=v", "trailing\\", "tab\tand\nnewline", ""],
+)
+def test_tags_are_escaped_like_point(tag: str) -> None:
+    """Tag values are escaped, and empty values dropped, as Point does."""
+    assert_same_record(
+        SensorReading(location=tag, sensor_id="temp 001", value=1.0, timestamp=NAIVE)
+    )
+
+
+def test_measurement_is_escaped_like_point() -> None:
+    """Measurement names escape commas and spaces."""
+    assert_same_record(SensorReading(measurement="my sensors,v2", timestamp=NAIVE))
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        'say "hi"',
+        "back\\slash",
+        "comma, space=equals",
+        "",
+        True,
+        False,
+        0,
+        -42,
+        2**40,
+        1.0,
+        -0.5,
+        1e-7,
+        123456789.125,
+        1e21,
+    ],
+)
+def test_field_values_match_point(value: Any) -> None:
+    """String, bool, int and float fields format the same as Point."""
+    assert_same_record(
+        SensorReading(sensor_id="s", metadata={"extra": value}, timestamp=NAIVE)
+    )
+
+
+@pytest.mark.parametrize("value", [math.nan, math.inf, -math.inf, None])
+def test_non_finite_and_none_fields_are_skipped(value: Any) -> None:
+    """NaN, infinities and None are left out of the record."""
+    reading = SensorReading(sensor_id="s", metadata={"extra": value}, timestamp=NAIVE)
+    assert "extra=" not in reading.to_line_protocol()
+    assert_same_record(reading)
+
+
+def test_field_keys_are_escaped_like_point() -> None:
+    """Field keys escape commas, equals signs and spaces."""
+    assert_same_record(
+        SensorReading(metadata={"odd key,=": 1.5}, sensor_id="s", timestamp=NAIVE)
+    )
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    [
+        NAIVE,
+        AWARE,
+        AWARE.astimezone(timezone.utc),
+        datetime(1969, 12, 31, 23, 59, 59, 1),
+        datetime(2262, 4, 11),
+    ],
+)
+def test_timestamps_match_point(timestamp: datetime) -> None:
+    """Naive timestamps are UTC; aware ones are converted from their offset."""
+    assert_same_record(SensorReading(sensor_id="s", timestamp=timestamp))
+
+
+def test_aware_timestamp_is_converted_to_utc() -> None:
+    """A +05:00 timestamp lands five hours before the same naive wall time."""
+    naive_ns = int(SensorReading(timestamp=NAIVE).to_line_protocol().rsplit(" ")[-1])
+    aware_ns = int(SensorReading(timestamp=AWARE).to_line_protocol().rsplit(" ")[-1])
+    assert naive_ns - aware_ns == 5 * 3600 * 10**9
+
+
+def test_sensor_reading_skips_none_tag() -> None:
+    """A None tag is left out of the record, as Point does."""
+    reading = SensorReading(
+        location=None,  # type: ignore[arg-type]
+        sensor_id="temp_001",
+        value=1.5,
+        timestamp=NAIVE,
+    )
+    assert ",location=" not in reading.to_line_protocol()
+    assert_same_record(reading)
+
+
+def test_pump_reading_matches_point() -> None:
+    """Pump readings include the pump fields after the sensor fields."""
+    assert_same_record(
+        PumpReading(
+            location="main station",
+            sensor_id="pump_001",
+            value=50,
+            flow_rate=50,
+            pressure=2,
+            temperature=32.51,
+            power_consumption=250,
+            rpm=1500.0,
+            vibration=math.nan,
+            metadata={"is_running": True, "target_speed": 50.0},
+            timestamp=AWARE,
+        )
+    )
+
+
+def test_system_metric_matches_point() -> None:
+    """System metrics merge their additional fields into the record."""
+    assert_same_record(
+        SystemMetric(
+            host="pumptech_system",
+            component="hardware",
+            metric_name="hardware_status",
+            metric_value=6.0,
+            metric_unit="count",
+            additional_fields={"total_pumps": 2, "running": False},
+            timestamp=NAIVE,
+        )
+    )
+
+
+def test_alarm_event_matches_point() -> None:
+    """Alarm events serialize their context as fields."""
+    assert_same_record(
+        AlarmEvent(
+            source="mock system",
+            severity="warning",
+            message='Pump "2" overheating',
+            alarm_code="MOCK_1234",
+            context={"temperature": 81.5},
+            timestamp=NAIVE,
+        )
+    )